@@ -17,3 +17,4 @@ from .coref import *
 
 from .util.wspos import *
 from .util.parse_tree import *
+from .util.clause import *
@@ -20,6 +20,7 @@ from .base import (
 
 from .util.parse_tree import (
     ParseTree as _ParseTree,
+    CompactParseTree as _CompactParseTree,
 )
 
 ################################################################################################################################
@@ -77,9 +78,14 @@ class ParseClause(_BaseTuple, _ParseClause):
     def to_text(self):
         return self.clause
 
-    def to_tree(self):
+    def to_tree(self, *, compact=False):
         """Transform to tree format.
 
+        Parameters
+        ----------
+            compact : bool
+                return a :class:`~.util.parse_tree.CompactParseTree` instead.
+
         Returns
         -------
             :class:`~.util.parse_tree.ParseTree`
@@ -89,7 +95,24 @@ class ParseClause(_BaseTuple, _ParseClause):
             :meth:`ParseTree.from_text() <.util.parse_tree.ParseTree.from_text>`.
 
         """
-        return _ParseTree.from_text(self.clause) if self.clause else None
+        if not self.clause:
+            return None
+        return (_CompactParseTree if compact else _ParseTree).from_text(self.clause)
+
+    _tree = None  # the cached tree (see tree)
+
+    @property
+    def tree(self):
+        """:class:`~.util.parse_tree.CompactParseTree`: The cached tree format of this clause. (`None` if **clause** is `None`)
+
+        The tree is parsed on first access and cached in the ``_tree`` attribute of this clause. Since the clause is
+        immutable, the cache is never stale; a new clause (e.g. from :meth:`_replace`) starts with an empty cache.
+        The tree is read-only; use :meth:`to_tree` to get a new (modifiable) :class:`~.util.parse_tree.ParseTree`
+        instead.
+        """
+        if self._tree is None and self.clause:
+            self._tree = _CompactParseTree.from_text(self.clause)
+        return self._tree
 
 ################################################################################################################################
 
@@ -146,6 +169,27 @@ class ParseSentence(_BaseList):
 
     item_class = ParseClause
 
+    @property
+    def trees(self):
+        """List[:class:`~.util.parse_tree.CompactParseTree`]: The cached trees of the clauses (see :attr:`ParseClause.tree`)."""
+        return [clause.tree for clause in self]
+
+    def write_penn(self, buffer, *, with_role=True, with_word=True, sep=':'):
+        """Write the bracketed Penn Treebank text of the clauses into a buffer.
+
+        One tree per line; the clauses without parse tree are skipped, and the delims are ignored.
+        See :meth:`ParseTree.write_penn() <.util.parse_tree.ParseTree.write_penn>` for the parameters.
+
+        Parameters
+        ----------
+            buffer : List[str]
+                The output buffer. Use ``''.join(buffer)`` to get the text.
+        """
+        for tree in self.trees:
+            if tree is not None:
+                tree.write_penn(buffer, with_role=with_role, with_word=with_word, sep=sep)
+                buffer.append('\n')
+
 class ParseParagraph(_BaseList):
     """A list of parse sentence.
 
@@ -236,3 +280,18 @@ class ParseParagraph(_BaseList):
     from_text = NotImplemented
 
     item_class = ParseSentence
+
+    def write_penn(self, buffer, *, with_role=True, with_word=True, sep=':'):
+        """Write the bracketed Penn Treebank text of the sentences into a buffer.
+
+        One tree per line, and the sentences are separated by empty lines.
+        See :meth:`ParseSentence.write_penn` for details.
+
+        Parameters
+        ----------
+            buffer : List[str]
+                The output buffer. Use ``''.join(buffer)`` to get the text.
+        """
+        for sent in self:
+            sent.write_penn(buffer, with_role=with_role, with_word=with_word, sep=sep)
+            buffer.append('\n')
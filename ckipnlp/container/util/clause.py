@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+This module provides clause segmentation utilities for word-segmented sentences with part-of-speech-tags.
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+from itertools import (
+    chain as _chain,
+)
+
+from typing import (
+    NamedTuple as _NamedTuple,
+    Tuple as _Tuple,
+)
+
+import numpy as _np
+
+from ..seg import (
+    SegParagraph as _SegParagraph,
+)
+
+################################################################################################################################
+
+_WORD = 0
+_DELIM = 1
+_WHITESPACE = 2
+
+_POS2KIND = {}  # POS-tag => kind of token
+
+def _pos_kind(pos):
+    try:
+        return _POS2KIND[pos]
+    except KeyError:
+        if pos == 'WHITESPACE':
+            kind = _WHITESPACE
+        elif pos.endswith('CATEGORY') and pos != 'PAUSECATEGORY':
+            kind = _DELIM
+        else:
+            kind = _WORD
+        _POS2KIND[pos] = kind
+        return kind
+
+################################################################################################################################
+
+class ClauseSpan(_NamedTuple):
+    """A clause of a word-segmented sentence.
+
+    Attributes
+    ----------
+        idxs : Tuple[int, ...]
+            the indices of the words of this clause (`None` for the leading punctuations of a sentence).
+        start : int
+            the index of the first token (word or punctuation) of this span.
+        end : int
+            the index after the last token (word or punctuation) of this span.
+        delim : str
+            the punctuations after this clause.
+
+    Note
+    ----
+        ``WHITESPACE`` tokens are never included in **idxs** nor **delim**.
+    """
+
+    idxs: _Tuple[int, ...] = None
+    start: int = 0
+    end: int = 0
+    delim: str = ''
+
+def segment_clauses(*, ws, pos):
+    """Segment word-segmented sentences into clauses by punctuations.
+
+    A clause ends at the punctuations (POS-tags ``*CATEGORY`` except ``PAUSECATEGORY``),
+    which are collected into the **delim** of the clause.
+
+    Parameters
+    ----------
+        ws : :class:`~ckipnlp.container.seg.SegParagraph`
+            The word-segmented sentences.
+        pos : :class:`~ckipnlp.container.seg.SegParagraph`
+            The part-of-speech sentences.
+
+    Returns
+    -------
+        List[List[:class:`ClauseSpan`]]
+            the clauses of each sentence.
+    """
+    assert isinstance(ws, _SegParagraph)
+    assert isinstance(pos, _SegParagraph)
+
+    # Flatten the paragraph
+    lens = _np.fromiter(map(len, pos), dtype=_np.int64, count=len(pos))
+    offsets = _np.concatenate([[0], _np.cumsum(lens)])
+    flat_ws = list(_chain.from_iterable(ws))
+    kinds = _np.fromiter(map(_pos_kind, _chain.from_iterable(pos)), dtype=_np.int8, count=offsets[-1])
+    sent_ids = _np.repeat(_np.arange(len(pos)), lens)
+
+    # Drop whitespaces
+    keep = _np.flatnonzero(kinds != _WHITESPACE)
+    kinds = kinds[keep]
+    sent_ids = sent_ids[keep]
+    local_idxs = keep - offsets[sent_ids]
+
+    # A clause starts at the beginning of a sentence, or at a word after a punctuation
+    is_start = _np.ones(len(keep), dtype=bool)
+    is_start[1:] = (sent_ids[1:] != sent_ids[:-1]) | ((kinds[1:] == _WORD) & (kinds[:-1] == _DELIM))
+    starts = _np.flatnonzero(is_start)
+    ends = _np.append(starts[1:], len(keep))
+    num_words = _np.add.reduceat((kinds == _WORD).astype(_np.int64), starts) if len(starts) else starts
+
+    # Collect clauses
+    clauses_list = [[] for _ in range(len(pos))]
+    local_idxs = local_idxs.tolist()
+    keep = keep.tolist()
+    for idx0, idx1, sent_id, num_word in zip(
+        starts.tolist(), ends.tolist(), sent_ids[starts].tolist(), num_words.tolist(),
+    ):
+        delim = ''.join(flat_ws[idx] for idx in keep[idx0+num_word:idx1])
+        if not num_word and not delim:
+            continue
+        clauses_list[sent_id].append(ClauseSpan(
+            idxs=tuple(local_idxs[idx0:idx0+num_word]) if num_word else None,
+            start=local_idxs[idx0],
+            end=local_idxs[idx1-1]+1,
+            delim=delim,
+        ))
+
+    return clauses_list
@@ -10,6 +10,16 @@ __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
 
+import re as _re
+
+from bisect import (
+    bisect_left as _bisect_left,
+)
+
+from array import (
+    array as _array,
+)
+
 from collections import (
     deque as _deque,
 )
@@ -230,141 +240,118 @@ class ParseRelation(_Base, _ParseRelation):
 
 ################################################################################################################################
 
-class ParseTree(_Base, _Tree):
-    """A parse tree.
-
-    See Also
-    --------
-        treereelib.tree.Tree: Please refer `<https://treelib.readthedocs.io/>`__ for built-in usages.
-
-    .. admonition:: Data Structure Examples
-
-        Text format
-            Used for :meth:`from_text` and :meth:`to_text`.
-
-            .. code-block:: python
-
-                'S(Head:Nab:中文字|particle:Td:耶)'
-
-        List format
-            Not implemented.
+_TREE_TOKEN_RE = _re.compile(r'[()|]|[^()|]+')
 
-        Dict format
-            Used for :meth:`from_dict` and :meth:`to_dict`.
-            A dictionary such as ``{ 'id': 0, 'data': { ... }, 'children': [ ... ] }``,
-            where ``'data'`` is a dictionary with the same format as :meth:`ParseNodeData.to_dict`,
-            and ``'children'`` is a list of dictionaries of subtrees with the same format as this tree.
+def _tokenize_tree_text(data, data_from_text):
+    """Tokenize a parse tree in text format.
 
-            .. code-block:: python
+    Parameters
+    ----------
+        data : str
+            A parse tree in text format.
+        data_from_text : Callable[[str], :class:`ParseNodeData`]
+            The parser of the node data.
+
+    Yields
+    ------
+        int
+            the ID of the parent node (``-1`` for the root node).
+        str
+            the text of the node.
+        :class:`ParseNodeData`
+            the data of the node.
 
-                {
-                    'id': 0,
-                    'data': {
-                        'role': None,
-                        'pos': 'S',
-                        'word': None,
-                    },
-                    'children': [
-                        {
-                            'id': 1,
-                            'data': {
-                                'role': 'Head',
-                                'pos': 'Nab',
-                                'word': '中文字',
-                            },
-                            'children': [],
-                        },
-                        {
-                            'id': 2,
-                            'data': {
-                                'role': 'particle',
-                                'pos': 'Td',
-                                'word': '耶',
-                            },
-                            'children': [],
-                        },
-                    ],
-                }
+    Note
+    ----
+        The nodes are yielded in the order of their IDs (pre-order).
+        The node data is parsed before the parent is looked up, so malformed text raises the same errors as the
+        character-wise parser did.
+    """
+    node_stack = [-1]
+    node_id = 0
+    text = ''
+    ending = True
+
+    for token in _TREE_TOKEN_RE.findall(data):
+        if token == '(':
+            node_data = data_from_text(text)
+            yield node_stack[-1], text, node_data
+            node_stack.append(node_id)
+            node_id += 1
+            text = ''
 
-        Penn Treebank format
-            Used for :meth:`from_penn` and :meth:`to_penn`.
+        elif token == ')':
+            if not ending:
+                node_data = data_from_text(text)
+                yield node_stack[-1], text, node_data
+                node_id += 1
+            node_stack.pop()
+            text = ''
+            ending = True
+
+        elif token == '|':
+            if not ending:
+                node_data = data_from_text(text)
+                yield node_stack[-1], text, node_data
+                node_id += 1
+            text = ''
+            ending = True
 
-            .. code-block:: python
+        else:
+            text = token
+            ending = False
 
-                [
-                    'S',
-                    [ 'Head:Nab', '中文字', ],
-                    [ 'particle:Td', '耶', ],
-                ]
+################################################################################################################################
 
-    .. note::
+_SEP_MARKER = object()    # the stack marker of a separator for the iterative serializers
+_CLOSE_MARKER = object()  # the stack marker of a closing bracket for the iterative serializers
 
-        One may use :meth:`to_penn` together with `SvgLing <https://pypi.org/project/svgling/>`__ to generate SVG tree graphs.
+class _ParseTreeMixin:
+    """The queries and serializers shared by :class:`ParseTree` and :class:`CompactParseTree`.
 
+    The subclasses provide ``root``, ``nodes``, ``__getitem__`` and ``children`` (with the treelib semantics).
     """
 
-    node_class = ParseNode
-
-    from_list = NotImplemented
-    to_list = NotImplemented
-
     def __str__(self):
         return self.to_text()
 
     ########################################################################################################################
 
-    @classmethod
-    def from_text(cls, data):
-        """Construct an instance from text format.
-
-        Parameters
-        ----------
-            data : str
-                A parse tree in text format (:class:`ParseClause.clause <.parse.ParseClause>`).
-
-        .. seealso::
-            :meth:`ParseClause.to_tree() <.parse.ParseClause.to_tree>`.
-        """
-
-        tree = cls()
-        node_id = 0
-        node_stack = [None]
-        text = ''
-        ending = True
-
-        for char in data:
-            if char == '(':
-                node_data = cls.node_class.data_class.from_text(text)
-                tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
-
-                node_stack.append(node_id)
-                node_id += 1
-                text = ''
+    @property
+    def analysis(self):
+        """:class:`ParseTreeAnalysis`: The cached analysis of this tree (recomputed after the tree is modified)."""
+        return self._get_analysis(semantic=True)
+
+    def _get_analysis(self, *, semantic):
+        analyses = getattr(self, '_analyses', None)
+        if analyses is None:
+            analyses = self._analyses = {}
+        analysis = analyses.get(semantic)
+        if analysis is None:
+            analysis = analyses[semantic] = ParseTreeAnalysis(self, semantic=semantic)
+        return analysis
 
-            elif char == ')':
-                if not ending:
-                    node_data = cls.node_class.data_class.from_text(text)
-                    tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
-                    node_id += 1
+    @property
+    def index(self):
+        """:class:`ParseTreeIndex`: The cached node index of this tree (recomputed after the tree is modified)."""
+        index = getattr(self, '_index', None)
+        if index is None:
+            index = self._index = ParseTreeIndex(self)
+        return index
 
-                node_stack.pop()
-                text = ''
-                ending = True
+    def _clear_caches(self):
+        self._analyses = None
+        self._index = None
 
-            elif char == '|':
-                if not ending:
-                    node_data = cls.node_class.data_class.from_text(text)
-                    tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
-                    node_id += 1
+    ########################################################################################################################
 
-                text = ''
-                ending = True
+    def _child_ids(self, node_id):
+        return [child.identifier for child in self.children(node_id)]
 
-            else:
-                ending = False
-                text += char
+    def _node_data(self, node_id):
+        return self[node_id].data
 
-        return tree
+    ########################################################################################################################
 
     def to_text(self, node_id=None):
         """Transform to plain text.
@@ -378,42 +365,57 @@ class ParseTree(_Base, _Tree):
         --------
             str
         """
-        if node_id is None:
-            node_id = self.root
-
-        node = self[node_id]
-        tree_text = node.data.to_text()
+        buffer = []
+        self.write_text(buffer, node_id)
+        return ''.join(buffer)
 
-        children_text = '|'.join((self.to_text(child.identifier) for child in self.children(node_id)))
-        if children_text:
-            tree_text = '{}({})'.format(tree_text, children_text)
+    def write_text(self, buffer, node_id=None):
+        """Write the plain text into a buffer.
 
-        return tree_text
-
-    @classmethod
-    def from_dict(cls, data):
-        """Construct an instance from python built-in containers.
+        The tree is traversed iteratively, so deep trees do not hit the recursion limit.
 
         Parameters
         ----------
-            data : str
-                A parse tree in dictionary format.
+            buffer : List[str]
+                The output buffer. The text is appended as pieces of strings; use ``''.join(buffer)`` to get the text.
+            node_id : int
+                Output the plain text format for the subtree under **node_id**.
         """
-        tree = cls()
-
-        node_queue = _deque()
-        node_queue.append((data, None,))
-
-        while node_queue:
-            node_dict, parent_id = node_queue.popleft()
-            node_id = node_dict['id']
-            node_data = cls.node_class.data_class.from_dict(node_dict['data'])
-            tree.create_node(tag=node_data.to_text(), identifier=node_id, parent=parent_id, data=node_data)
+        if node_id is None:
+            node_id = self.root
+        self[node_id]  # pylint: disable=pointless-statement
 
-            for child in node_dict['children']:
-                node_queue.append((child, node_id,))
+        written = 0  # the length of the written text
+        open_stack = []  # the index of '(' in buffer and the written length after it
+        node_stack = [node_id]
+        while node_stack:
+            item = node_stack.pop()
+            if item is _SEP_MARKER:
+                buffer.append('|')
+                written += 1
+
+            elif item is _CLOSE_MARKER:
+                open_idx, open_written = open_stack.pop()
+                if written == open_written:
+                    buffer[open_idx] = ''  # no children text, remove '('
+                else:
+                    buffer.append(')')
+                    written += 2
 
-        return tree
+            else:
+                text = self._node_data(item).to_text()
+                buffer.append(text)
+                written += len(text)
+
+                child_ids = self._child_ids(item)
+                if child_ids:
+                    open_stack.append((len(buffer), written,))
+                    buffer.append('(')
+                    node_stack.append(_CLOSE_MARKER)
+                    for child_id in reversed(child_ids[1:]):
+                        node_stack.append(child_id)
+                        node_stack.append(_SEP_MARKER)
+                    node_stack.append(child_ids[0])
 
     def to_dict(self, node_id=None):
         """Transform to python built-in containers.
@@ -430,44 +432,17 @@ class ParseTree(_Base, _Tree):
         if node_id is None:
             node_id = self.root
 
-        tree_dict = self[node_id].to_dict()
-        tree_dict['children'] = []
-
-        for child in self.children(node_id):
-            tree_dict['children'].append(self.to_dict(child.identifier))
-
-        return tree_dict
-
-    @classmethod
-    def from_penn(cls, data):
-        """Construct an instance from Penn Treebank format."""
-        tree = cls()
-
-        node_stack = _deque()
-        node_stack.append((data, None,))
-
-        node_id = 0
-
+        tree_dicts = []
+        node_stack = [(node_id, tree_dicts,)]
         while node_stack:
-            penn_data, parent_id = node_stack.pop()
-
-            if not penn_data:
-                raise SyntaxError(f'Empty node #{node_id}')
-
-            if not isinstance(penn_data[0], str):
-                raise SyntaxError(f'First element of a node must be string, got {type(penn_data[0])}')
-
-            if len(penn_data) == 2 and isinstance(penn_data[-1], str):
-                penn_data = (':'.join(penn_data),)
-
-            node_data = cls.node_class.data_class.from_text(penn_data[0])
-            tree.create_node(tag=node_data.to_text(), identifier=node_id, parent=parent_id, data=node_data)
-
-            for child in penn_data[-1:0:-1]:
-                node_stack.append((child, node_id,))
-            node_id += 1
+            node_id, siblings = node_stack.pop()
+            node_dict = self[node_id].to_dict()
+            node_dict['children'] = children = []
+            siblings.append(node_dict)
+            for child_id in reversed(self._child_ids(node_id)):
+                node_stack.append((child_id, children,))
 
-        return tree
+        return tree_dicts[0]
 
     def to_penn(self, node_id=None, *, with_role=True, with_word=True, sep=':'):
         """Transform to Penn Treebank format.
@@ -489,26 +464,67 @@ class ParseTree(_Base, _Tree):
         """
         if node_id is None:
             node_id = self.root
-        node = self[node_id]
+        self[node_id]  # pylint: disable=pointless-statement
 
-        penn_data = [f'{node.data.role}{sep}{node.data.pos}' if with_role and node.data.role else node.data.pos,]
-        if with_word and node.data.word:
-            penn_data.append(node.data.word)
+        penn_data = []
+        node_stack = [(node_id, penn_data,)]
+        while node_stack:
+            node_id, siblings = node_stack.pop()
+            node_data = self._node_data(node_id)
+            node_penn = [f'{node_data.role}{sep}{node_data.pos}' if with_role and node_data.role else node_data.pos,]
+            if with_word and node_data.word:
+                node_penn.append(node_data.word)
+            siblings.append(node_penn)
+            for child_id in reversed(self._child_ids(node_id)):
+                node_stack.append((child_id, node_penn,))
 
-        for child in self.children(node_id):
-            penn_data.append(self.to_penn(child.identifier, with_role=with_role, with_word=with_word, sep=sep))
+        return penn_data[0]
 
-        return penn_data
+    def write_penn(self, buffer, node_id=None, *, with_role=True, with_word=True, sep=':'):
+        """Write the bracketed Penn Treebank text into a buffer.
 
-    ########################################################################################################################
+        For example, ``'(S (Head:Nab 中文字) (particle:Td 耶))'``.
 
-    def show(self, *,
-        key=lambda node: node.identifier,
-        idhidden=False,
-        **kwargs,
-    ):
-        """Show pretty tree."""
-        _Tree.show(self, key=key, idhidden=idhidden, **kwargs)
+        Parameters
+        ----------
+            buffer : List[str]
+                The output buffer. The text is appended as pieces of strings; use ``''.join(buffer)`` to get the text.
+            node_id : int
+                Output the Penn Treebank text for the subtree under **node_id**.
+            with_role : bool
+                Contains role-tag or not.
+            with_word : bool
+                Contains word or not.
+            sep : str
+                The seperator between role and POS-tag.
+        """
+        if node_id is None:
+            node_id = self.root
+        self[node_id]  # pylint: disable=pointless-statement
+
+        node_stack = [node_id]
+        while node_stack:
+            item = node_stack.pop()
+            if item is _SEP_MARKER:
+                buffer.append(' ')
+
+            elif item is _CLOSE_MARKER:
+                buffer.append(')')
+
+            else:
+                node_data = self._node_data(item)
+                buffer.append('(')
+                buffer.append(f'{node_data.role}{sep}{node_data.pos}' if with_role and node_data.role else node_data.pos or '')
+                if with_word and node_data.word:
+                    buffer.append(' ')
+                    buffer.append(node_data.word)
+
+                node_stack.append(_CLOSE_MARKER)
+                for child_id in reversed(self._child_ids(item)):
+                    node_stack.append(child_id)
+                    node_stack.append(_SEP_MARKER)
+
+    ########################################################################################################################
 
     def get_children(self, node_id, *, role):
         """Get children of a node with given role.
@@ -529,6 +545,37 @@ class ParseTree(_Base, _Tree):
             if child.data.role == role:
                 yield child
 
+    def find(self, root_id=None, *, role=None, role_in=None, pos=None, pos_in=None, pos_prefix=None):
+        """Find the nodes matching all the given conditions with the node index (see :attr:`index`).
+
+        Parameters
+        ----------
+            root_id : int
+                ID of the root node of target subtree (search the whole tree if `None`).
+            role : str
+                the role.
+            role_in : Collection[str]
+                the candidates of the role.
+            pos : str
+                the POS-tag.
+            pos_in : Collection[str]
+                the candidates of the POS-tag.
+            pos_prefix : str
+                the prefix of the POS-tag.
+
+        Returns
+        -------
+            List[:class:`ParseNode`]
+                the matched nodes (in pre-order).
+
+        Example
+        -------
+            Find the nouns with subject roles::
+
+                tree.find(pos_prefix='N', role_in=SUBJECT_ROLES)
+        """
+        return self.index.find(root_id, role=role, role_in=role_in, pos=pos, pos_in=pos_in, pos_prefix=pos_prefix)
+
     def get_heads(self, root_id=None, *, semantic=True, deep=True):
         """Get all head nodes of a subtree.
 
@@ -548,44 +595,10 @@ class ParseTree(_Base, _Tree):
         """
         if root_id is None:
             root_id = self.root
+        self[root_id]  # pylint: disable=pointless-statement
 
-        head_nodes = []
-        children = list(self.children(root_id))
-
-        # No child, choose the root node instead
-        if not children:
-            head_nodes.append(self[root_id])
-
-        # Semantic mode
-        if semantic:
-            # Find DUMMY
-            if not head_nodes:
-                for child in children:
-                    if child.data.role in ('DUMMY', 'DUMMY1', 'DUMMY2',):
-                        head_nodes.append(child)
-
-            # Find head
-            if not head_nodes:
-                for child in children:
-                    if child.data.role == 'head':
-                        head_nodes.append(child)
-
-        # Find Head
-        if not head_nodes:
-            for child in children:
-                if child.data.role == 'Head':
-                    head_nodes.append(child)
-
-        # Found no head, choose the last child instead
-        if not head_nodes:
-            head_nodes.append(children[-1])
-
-        # Recursion
-        for node in head_nodes:
-            if deep and not node.is_leaf():
-                yield from self.get_heads(node.identifier, semantic=semantic)
-            else:
-                yield node
+        analysis = self._get_analysis(semantic=semantic)
+        yield from (analysis.heads if deep else analysis.head_children)[root_id]
 
     def get_relations(self, root_id=None, *, semantic=True):
         """Get all relations of a subtree.
@@ -601,31 +614,64 @@ class ParseTree(_Base, _Tree):
         ------
             :class:`ParseRelation`
                 the relations.
+
+        Notes
+        -----
+            The cached :attr:`analysis` is used if it exists; otherwise the subtree is traversed once without caching.
         """
         if root_id is None:
             root_id = self.root
-
-        children = list(self.children(root_id))
-        head_children = list(self.get_heads(root_id, semantic=semantic, deep=False))
-
-        # Get heads
-        for head_node in self.get_heads(root_id, semantic=semantic):
-            # Get tails
-            for tail in children:
-                if tail.data.role != 'Head' and tail not in head_children:
-                    if tail.is_leaf():
+        self[root_id]  # pylint: disable=pointless-statement
+
+        analysis = (getattr(self, '_analyses', None) or {}).get(semantic)
+        if analysis is not None:
+            yield from analysis.get_relations(root_id)
+        else:  # a single query is cheaper without building the analysis of the whole tree
+            yield from self._iter_relations(root_id, semantic=semantic)
+
+    def _iter_relations(self, root_id, *, semantic):
+        """Get the relations of a subtree with one traversal of it (without caching)."""
+
+        # Pre-order traversal
+        order = []
+        child_ids = {}
+        roles = {}
+        stack = [root_id]
+        while stack:
+            node_id = stack.pop()
+            order.append(node_id)
+            child_ids[node_id] = node_child_ids = self._child_ids(node_id)
+            roles[node_id] = self._node_data(node_id).role
+            stack.extend(reversed(node_child_ids))
+
+        # Heads (children before parents; a leaf is the head of itself)
+        head_idxs = {}
+        head_ids = {}
+        for node_id in reversed(order):
+            node_child_ids = child_ids[node_id]
+            if not node_child_ids:
+                head_ids[node_id] = (node_id,)
+                continue
+            idxs = head_idxs[node_id] = _find_head_idxs([roles[child_id] for child_id in node_child_ids], semantic=semantic)
+            head_ids[node_id] = head_ids[node_child_ids[idxs[0]]] if len(idxs) == 1 else \
+                                tuple(head_id for idx in idxs for head_id in head_ids[node_child_ids[idx]])
+
+        # Relations (parents before children)
+        for node_id in order:
+            idxs = head_idxs.get(node_id)
+            if idxs is None:
+                continue
+            tail_ids = [
+                tail_id for idx, tail_id in enumerate(child_ids[node_id]) if roles[tail_id] != 'Head' and idx not in idxs
+            ]
+            for head_id in head_ids[node_id]:
+                head_node = self[head_id]
+                for tail_id in tail_ids:
+                    tail = self[tail_id]
+                    for tail_head_id in head_ids[tail_id]:
                         yield ParseRelation(  # pylint: disable=no-value-for-parameter
-                            head=head_node, tail=tail, relation=tail,
+                            head=head_node, tail=self[tail_head_id], relation=tail,
                         )
-                    else:
-                        for node in self.get_heads(tail.identifier, semantic=semantic):
-                            yield ParseRelation(  # pylint: disable=no-value-for-parameter
-                                head=head_node, tail=node, relation=tail,
-                            )
-
-        # Recursion
-        for child in children:
-            yield from self.get_relations(child.identifier, semantic=semantic)
 
     def get_subjects(self, root_id=None, *, semantic=True, deep=True):
         """Get the subject node of a subtree.
@@ -656,6 +702,10 @@ class ParseTree(_Base, _Tree):
             root_id = self.root
         root = self[root_id]
 
+        if deep and root_id == self.root:
+            yield from self._get_analysis(semantic=semantic).subjects
+            return
+
         if root.data.pos == 'NP':
             yield from self.get_heads(root.identifier, semantic=semantic, deep=deep)
 
@@ -668,3 +718,776 @@ class ParseTree(_Base, _Tree):
                            (subroot.data.role in _NEUTRAL_ROLES and subroot.identifier < head.identifier) \
                         ):
                             yield from self.get_heads(subroot.identifier, semantic=semantic, deep=deep)
+
+
+################################################################################################################################
+
+class ParseTree(_ParseTreeMixin, _Base, _Tree):
+    """A parse tree.
+
+    See Also
+    --------
+        treereelib.tree.Tree: Please refer `<https://treelib.readthedocs.io/>`__ for built-in usages.
+
+    .. admonition:: Data Structure Examples
+
+        Text format
+            Used for :meth:`from_text` and :meth:`to_text`.
+
+            .. code-block:: python
+
+                'S(Head:Nab:中文字|particle:Td:耶)'
+
+        List format
+            Not implemented.
+
+        Dict format
+            Used for :meth:`from_dict` and :meth:`to_dict`.
+            A dictionary such as ``{ 'id': 0, 'data': { ... }, 'children': [ ... ] }``,
+            where ``'data'`` is a dictionary with the same format as :meth:`ParseNodeData.to_dict`,
+            and ``'children'`` is a list of dictionaries of subtrees with the same format as this tree.
+
+            .. code-block:: python
+
+                {
+                    'id': 0,
+                    'data': {
+                        'role': None,
+                        'pos': 'S',
+                        'word': None,
+                    },
+                    'children': [
+                        {
+                            'id': 1,
+                            'data': {
+                                'role': 'Head',
+                                'pos': 'Nab',
+                                'word': '中文字',
+                            },
+                            'children': [],
+                        },
+                        {
+                            'id': 2,
+                            'data': {
+                                'role': 'particle',
+                                'pos': 'Td',
+                                'word': '耶',
+                            },
+                            'children': [],
+                        },
+                    ],
+                }
+
+        Penn Treebank format
+            Used for :meth:`from_penn` and :meth:`to_penn`.
+
+            .. code-block:: python
+
+                [
+                    'S',
+                    [ 'Head:Nab', '中文字', ],
+                    [ 'particle:Td', '耶', ],
+                ]
+
+    .. note::
+
+        One may use :meth:`to_penn` together with `SvgLing <https://pypi.org/project/svgling/>`__ to generate SVG tree graphs.
+
+    """
+
+    node_class = ParseNode
+
+    from_list = NotImplemented
+    to_list = NotImplemented
+
+    ########################################################################################################################
+
+    def add_node(self, node, parent=None):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        super().add_node(node, parent=parent)
+
+    def remove_node(self, identifier):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        return super().remove_node(identifier)
+
+    def move_node(self, source, destination):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        super().move_node(source, destination)
+
+    def paste(self, nid, new_tree, deep=False):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        super().paste(nid, new_tree, deep=deep)
+
+    def remove_subtree(self, nid, identifier=None):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        return super().remove_subtree(nid, identifier=identifier)
+
+    def link_past_node(self, nid):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        super().link_past_node(nid)
+
+    def update_node(self, nid, **attrs):  # pylint: disable=missing-docstring
+        self._clear_caches()
+        super().update_node(nid, **attrs)
+
+    def _child_ids(self, node_id):
+        return self.is_branch(node_id)
+
+    ########################################################################################################################
+
+    @classmethod
+    def from_text(cls, data):
+        """Construct an instance from text format.
+
+        Parameters
+        ----------
+            data : str
+                A parse tree in text format (:class:`ParseClause.clause <.parse.ParseClause>`).
+
+        .. seealso::
+            :meth:`ParseClause.to_tree() <.parse.ParseClause.to_tree>`.
+        """
+
+        tree = cls()
+        data_from_text = cls.node_class.data_class.from_text
+        for node_id, (parent_id, text, node_data,) in enumerate(_tokenize_tree_text(data, data_from_text)):
+            tree.create_node(tag=text, identifier=node_id, parent=parent_id if parent_id >= 0 else None, data=node_data)
+
+        return tree
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construct an instance from python built-in containers.
+
+        Parameters
+        ----------
+            data : str
+                A parse tree in dictionary format.
+        """
+        tree = cls()
+
+        node_queue = _deque()
+        node_queue.append((data, None,))
+
+        while node_queue:
+            node_dict, parent_id = node_queue.popleft()
+            node_id = node_dict['id']
+            node_data = cls.node_class.data_class.from_dict(node_dict['data'])
+            tree.create_node(tag=node_data.to_text(), identifier=node_id, parent=parent_id, data=node_data)
+
+            for child in node_dict['children']:
+                node_queue.append((child, node_id,))
+
+        return tree
+
+    @classmethod
+    def from_penn(cls, data):
+        """Construct an instance from Penn Treebank format."""
+        tree = cls()
+
+        node_stack = _deque()
+        node_stack.append((data, None,))
+
+        node_id = 0
+
+        while node_stack:
+            penn_data, parent_id = node_stack.pop()
+
+            if not penn_data:
+                raise SyntaxError(f'Empty node #{node_id}')
+
+            if not isinstance(penn_data[0], str):
+                raise SyntaxError(f'First element of a node must be string, got {type(penn_data[0])}')
+
+            if len(penn_data) == 2 and isinstance(penn_data[-1], str):
+                penn_data = (':'.join(penn_data),)
+
+            node_data = cls.node_class.data_class.from_text(penn_data[0])
+            tree.create_node(tag=node_data.to_text(), identifier=node_id, parent=parent_id, data=node_data)
+
+            for child in penn_data[-1:0:-1]:
+                node_stack.append((child, node_id,))
+            node_id += 1
+
+        return tree
+
+    ########################################################################################################################
+
+    def show(self, *,
+        key=lambda node: node.identifier,
+        idhidden=False,
+        **kwargs,
+    ):
+        """Show pretty tree."""
+        _Tree.show(self, key=key, idhidden=idhidden, **kwargs)
+
+################################################################################################################################
+
+_SYMBOLS = [None]       # the interned roles and POS-tags; symbol ID => symbol
+_SYMBOL2ID = {None: 0}  # symbol => symbol ID
+
+def _intern_symbol(symbol):
+    try:
+        return _SYMBOL2ID[symbol]
+    except KeyError:
+        symbol_id = _SYMBOL2ID[symbol] = len(_SYMBOLS)
+        _SYMBOLS.append(symbol)
+        return symbol_id
+
+class CompactParseNode:
+    """A lightweight view of a node of :class:`CompactParseTree`.
+
+    Attributes
+    ----------
+        identifier : int
+            the node ID.
+        data : :class:`ParseNodeData`
+            the node data.
+        tag : str
+            the node data in text format.
+    """
+
+    __slots__ = ('_tree', 'identifier', '_data',)
+
+    def __init__(self, tree, identifier):
+        self._tree = tree
+        self.identifier = identifier
+        self._data = None
+
+    def __repr__(self):
+        return '{name}(tag={tag}, identifier={identifier})'.format(
+            name=self.__class__.__name__,
+            tag=self.tag,
+            identifier=self.identifier,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, CompactParseNode) and self._tree is other._tree and self.identifier == other.identifier
+
+    def __hash__(self):
+        return hash((id(self._tree), self.identifier,))
+
+    @property
+    def data(self):  # pylint: disable=missing-docstring
+        if self._data is None:
+            self._data = self._tree._node_data(self.identifier)  # pylint: disable=protected-access
+        return self._data
+
+    @property
+    def tag(self):  # pylint: disable=missing-docstring
+        return self.data.to_text()
+
+    def is_leaf(self, tree_id=None):  # pylint: disable=unused-argument
+        """Check if this node has no children."""
+        return self._tree._first_children[self.identifier] < 0  # pylint: disable=protected-access
+
+    def to_dict(self):
+        return dict(id=self.identifier, data=self.data.to_dict())
+
+class CompactParseTree(_ParseTreeMixin, _Base):
+    """A compact parse tree.
+
+    The nodes are stored in parallel arrays (the parent, first child, next sibling, interned role and POS-tag of each
+    node, and the words) instead of the :class:`ParseNode` objects, and :class:`CompactParseNode` views are created on
+    access. This tree is read-only, and the node IDs are the pre-order indices of the nodes.
+
+    Supports the same queries and formats as :class:`ParseTree` (except :meth:`ParseTree.show` and the treelib
+    modifiers). Use :meth:`to_parse_tree` to convert to a :class:`ParseTree`.
+
+    .. admonition:: Data Structure Examples
+
+        Text format
+            Used for :meth:`from_text` and :meth:`to_text`.
+
+            .. code-block:: python
+
+                'S(Head:Nab:中文字|particle:Td:耶)'
+
+        List format
+            Not implemented.
+
+        Dict format
+            Used for :meth:`from_dict` and :meth:`to_dict`. Same as :class:`ParseTree`.
+
+        Penn Treebank format
+            Used for :meth:`from_penn` and :meth:`to_penn`. Same as :class:`ParseTree`.
+    """
+
+    node_class = CompactParseNode
+
+    from_list = NotImplemented
+    to_list = NotImplemented
+
+    def __init__(self):
+        self._parents = _array('i')
+        self._first_children = _array('i')
+        self._next_siblings = _array('i')
+        self._last_children = _array('i')
+        self._roles = _array('I')
+        self._poss = _array('I')
+        self._words = []
+
+    def __getstate__(self):
+        # The symbol IDs are process-local, so the roles and POS-tags are pickled as strings (the caches are dropped)
+        state = {key: value for key, value in self.__dict__.items() if key not in ('_analyses', '_index',)}
+        state['_roles'] = [_SYMBOLS[symbol_id] for symbol_id in self._roles]
+        state['_poss'] = [_SYMBOLS[symbol_id] for symbol_id in self._poss]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._roles = _array('I', map(_intern_symbol, state['_roles']))
+        self._poss = _array('I', map(_intern_symbol, state['_poss']))
+
+    def _append(self, parent_id, data):
+        node_id = len(self._words)
+        if parent_id < 0 and node_id:
+            raise ValueError('The tree already has a root')
+
+        self._parents.append(parent_id)
+        self._first_children.append(-1)
+        self._next_siblings.append(-1)
+        self._last_children.append(-1)
+        self._roles.append(_intern_symbol(data.role))
+        self._poss.append(_intern_symbol(data.pos))
+        self._words.append(data.word)
+
+        if parent_id >= 0:
+            last_id = self._last_children[parent_id]
+            if last_id < 0:
+                self._first_children[parent_id] = node_id
+            else:
+                self._next_siblings[last_id] = node_id
+            self._last_children[parent_id] = node_id
+
+        return node_id
+
+    ########################################################################################################################
+
+    @property
+    def root(self):
+        """int: The ID of the root node (`None` if the tree is empty)."""
+        return 0 if self._words else None
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, node_id):
+        return isinstance(node_id, int) and 0 <= node_id < len(self._words)
+
+    def __getitem__(self, node_id):
+        if node_id not in self:
+            raise KeyError(node_id)
+        return self.node_class(self, node_id)
+
+    def get_node(self, node_id):
+        """Get the node view of **node_id** (`None` if not found)."""
+        return self.node_class(self, node_id) if node_id in self else None
+
+    @property
+    def nodes(self):
+        """Dict[int, :class:`CompactParseNode`]: The nodes (in pre-order)."""
+        return {node_id: self.node_class(self, node_id) for node_id in range(len(self._words))}
+
+    def children(self, node_id):
+        """Get the children of a node.
+
+        Returns
+        -------
+            List[:class:`CompactParseNode`]
+        """
+        if node_id not in self:
+            raise KeyError(node_id)
+
+        children = []
+        child_id = self._first_children[node_id]
+        while child_id >= 0:
+            children.append(self.node_class(self, child_id))
+            child_id = self._next_siblings[child_id]
+        return children
+
+    def parent(self, node_id):
+        """Get the parent of a node (`None` for the root node)."""
+        if node_id not in self:
+            raise KeyError(node_id)
+        parent_id = self._parents[node_id]
+        return self.node_class(self, parent_id) if parent_id >= 0 else None
+
+    def leaves(self):
+        """Get the leaf nodes (in pre-order).
+
+        Returns
+        -------
+            List[:class:`CompactParseNode`]
+        """
+        return [self.node_class(self, node_id) for node_id, child_id in enumerate(self._first_children) if child_id < 0]
+
+    ########################################################################################################################
+
+    def _child_ids(self, node_id):
+        child_ids = []
+        child_id = self._first_children[node_id]
+        while child_id >= 0:
+            child_ids.append(child_id)
+            child_id = self._next_siblings[child_id]
+        return child_ids
+
+    def _node_data(self, node_id):
+        return ParseNodeData(  # pylint: disable=no-value-for-parameter
+            _SYMBOLS[self._roles[node_id]], _SYMBOLS[self._poss[node_id]], self._words[node_id],
+        )
+
+    ########################################################################################################################
+
+    @classmethod
+    def from_text(cls, data):
+        """Construct an instance from text format.
+
+        Parameters
+        ----------
+            data : str
+                A parse tree in text format (:class:`ParseClause.clause <.parse.ParseClause>`).
+        """
+        tree = cls()
+        for parent_id, _, node_data in _tokenize_tree_text(data, ParseNodeData.from_text):
+            tree._append(parent_id, node_data)  # pylint: disable=protected-access
+
+        return tree
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construct an instance from python built-in containers.
+
+        Parameters
+        ----------
+            data : str
+                A parse tree in dictionary format. The node IDs must be the pre-order indices of the nodes.
+        """
+        tree = cls()
+
+        node_stack = [(data, -1,)]
+        while node_stack:
+            node_dict, parent_id = node_stack.pop()
+            node_id = tree._append(parent_id, ParseNodeData.from_dict(node_dict['data']))  # pylint: disable=protected-access
+            if node_dict['id'] != node_id:
+                raise ValueError(f'The node IDs must be the pre-order indices, expect {node_id}, got {node_dict["id"]}')
+
+            for child in reversed(node_dict['children']):
+                node_stack.append((child, node_id,))
+
+        return tree
+
+    @classmethod
+    def from_penn(cls, data):
+        """Construct an instance from Penn Treebank format."""
+        tree = cls()
+
+        node_stack = [(data, -1,)]
+        while node_stack:
+            penn_data, parent_id = node_stack.pop()
+
+            if not penn_data:
+                raise SyntaxError(f'Empty node #{len(tree)}')
+
+            if not isinstance(penn_data[0], str):
+                raise SyntaxError(f'First element of a node must be string, got {type(penn_data[0])}')
+
+            if len(penn_data) == 2 and isinstance(penn_data[-1], str):
+                penn_data = (':'.join(penn_data),)
+
+            node_id = tree._append(parent_id, ParseNodeData.from_text(penn_data[0]))  # pylint: disable=protected-access
+
+            for child in penn_data[-1:0:-1]:
+                node_stack.append((child, node_id,))
+
+        return tree
+
+    @classmethod
+    def from_parse_tree(cls, tree):
+        """Construct an instance from a :class:`ParseTree`.
+
+        Parameters
+        ----------
+            tree : :class:`ParseTree`
+                the parse tree. The node IDs must be the pre-order indices of the nodes.
+        """
+        return cls.from_dict(tree.to_dict())
+
+    def to_parse_tree(self):
+        """Transform to a :class:`ParseTree`.
+
+        Returns
+        -------
+            :class:`ParseTree`
+        """
+        tree = ParseTree()
+        for node_id, parent_id in enumerate(self._parents):
+            node_data = self.node_class(self, node_id).data
+            tree.create_node(
+                tag=node_data.to_text(), identifier=node_id, parent=parent_id if parent_id >= 0 else None, data=node_data,
+            )
+        return tree
+
+################################################################################################################################
+
+class ParseTreeAnalysis:
+    """The analysis of a parse tree.
+
+    The heads are memoized bottom-up in one traversal of the tree, and the relations and the subjects are computed from
+    them on first access. All the attributes take linear time of the tree size (plus the number of relations).
+
+    Arguments
+    ---------
+        tree : :class:`ParseTree`
+            the parse tree.
+        semantic : bool
+            use semantic/syntactic policy (please refer :meth:`ParseTree.get_heads` for policy detail).
+
+    Attributes
+    ----------
+        children : Dict[int, List[:class:`ParseNode`]]
+            the children of each node.
+        leaves : List[:class:`ParseNode`]
+            the leaf nodes (same as :meth:`ParseTree.leaves`).
+        head_children : Dict[int, Tuple[:class:`ParseNode`, ...]]
+            the head children of each node (same as :meth:`ParseTree.get_heads` with **deep** = `False`).
+        heads : Dict[int, Tuple[:class:`ParseNode`, ...]]
+            the head nodes of each subtree (same as :meth:`ParseTree.get_heads`).
+        relations : Tuple[:class:`ParseRelation`, ...]
+            the relations of the tree (same as :meth:`ParseTree.get_relations`).
+        subjects : Tuple[:class:`ParseNode`, ...]
+            the subject nodes of the tree (same as :meth:`ParseTree.get_subjects`).
+
+    Note
+    ----
+        Use :attr:`ParseTree.analysis` to get the cached analysis of a tree.
+    """
+
+    def __init__(self, tree, *, semantic=True):
+        self.semantic = semantic
+
+        nodes = tree.nodes
+        self.children = children = {node_id: tree.children(node_id) for node_id in nodes}
+        self.leaves = [node for node_id, node in nodes.items() if not children[node_id]]
+        child_ids = {node_id: [child.identifier for child in child_list] for node_id, child_list in children.items()}
+
+        # Pre-order traversal
+        order = []
+        if tree.root is not None:
+            stack = [tree.root]
+            while stack:
+                node_id = stack.pop()
+                order.append(node_id)
+                stack.extend(reversed(child_ids[node_id]))
+
+        # Heads (children before parents; a leaf is the head of itself)
+        head_idxs = {}
+        self.head_children = head_children = {}
+        self.heads = heads = {}
+        for node_id in reversed(order):
+            child_list = children[node_id]
+            if not child_list:
+                head_children[node_id] = heads[node_id] = (nodes[node_id],)
+                continue
+            idxs = head_idxs[node_id] = _find_head_idxs([child.data.role for child in child_list], semantic=semantic)
+            head_children[node_id] = tuple(child_list[idx] for idx in idxs)
+            heads[node_id] = tuple(head for idx in idxs for head in heads[child_ids[node_id][idx]])
+
+        self._nodes = nodes
+        self._child_ids = child_ids
+        self._order = order
+        self._head_idxs = head_idxs
+        self._relations = None
+        self._relation_spans = None
+        self._subjects = None
+
+    @property
+    def relations(self):  # pylint: disable=missing-docstring
+        if self._relations is None:
+            self._compute_relations()
+        return self._relations
+
+    @property
+    def subjects(self):  # pylint: disable=missing-docstring
+        if self._subjects is None:
+            self._compute_subjects()
+        return self._subjects
+
+    def _compute_relations(self):
+        children = self.children
+        child_ids = self._child_ids
+        heads = self.heads
+
+        # Parents before children
+        relations = []
+        relation_starts = {}
+        for node_id in self._order:
+            relation_starts[node_id] = len(relations)
+            if not children[node_id]:
+                continue
+            idxs = self._head_idxs[node_id]
+            tails = [
+                (tail, heads[tail_id],)
+                for idx, (tail, tail_id,) in enumerate(zip(children[node_id], child_ids[node_id]))
+                if tail.data.role != 'Head' and idx not in idxs
+            ]
+            for head_node in heads[node_id]:
+                for tail, tail_heads in tails:
+                    for node in tail_heads:
+                        relations.append(ParseRelation(  # pylint: disable=no-value-for-parameter
+                            head=head_node, tail=node, relation=tail,
+                        ))
+        self._relations = tuple(relations)
+
+        # The relations of a subtree are contiguous since the nodes of a subtree are contiguous in pre-order
+        self._relation_spans = relation_spans = {}
+        for node_id in reversed(self._order):
+            relation_end = relation_spans[child_ids[node_id][-1]][1] if child_ids[node_id] else relation_starts[node_id]
+            relation_spans[node_id] = (relation_starts[node_id], relation_end,)
+
+    def _compute_subjects(self):
+        children = self.children
+        child_ids = self._child_ids
+        heads = self.heads
+
+        subjects = []
+        if self._order:
+            root_id = self._order[0]
+            root = self._nodes[root_id]
+            if root.data.pos == 'NP':
+                subjects.extend(heads[root_id])
+            elif root.data.pos == 'S' and children[root_id]:
+                for idx in _find_head_idxs([child.data.role for child in children[root_id]], semantic=False):
+                    head_id = child_ids[root_id][idx]
+                    if children[root_id][idx].data.pos.startswith('V'):
+                        for subroot, subroot_id in zip(children[root_id], child_ids[root_id]):
+                            if subroot.data.pos.startswith('N') and ( \
+                                subroot.data.role in _SUBJECT_ROLES or \
+                               (subroot.data.role in _NEUTRAL_ROLES and subroot_id < head_id) \
+                            ):
+                                subjects.extend(heads[subroot_id])
+        self._subjects = tuple(subjects)
+
+    def get_relations(self, root_id):
+        """Get the relations of a subtree (same as :meth:`ParseTree.get_relations`).
+
+        Parameters
+        ----------
+            root_id : int
+                ID of the subtree root node.
+
+        Returns
+        -------
+            Tuple[:class:`ParseRelation`, ...]
+        """
+        if self._relations is None:
+            self._compute_relations()
+        relation_start, relation_end = self._relation_spans[root_id]
+        return self._relations[relation_start:relation_end]
+
+class ParseTreeIndex:
+    """The node index of a parse tree by role and by POS-tag.
+
+    Arguments
+    ---------
+        tree : :class:`ParseTree`
+            the parse tree.
+
+    Attributes
+    ----------
+        nodes : List[:class:`ParseNode`]
+            the nodes in pre-order.
+        roles : Dict[str, List[int]]
+            the role => the pre-order positions of the nodes with this role.
+        poss : Dict[str, List[int]]
+            the POS-tag => the pre-order positions of the nodes with this POS-tag.
+
+    Note
+    ----
+        Use :attr:`ParseTree.index` to get the cached index of a tree, and :meth:`ParseTree.find` to query it.
+    """
+
+    def __init__(self, tree):
+        self.nodes = nodes = []
+        self.roles = roles = {}
+        self.poss = poss = {}
+        self._positions = positions = {}  # node ID => pre-order position
+        parent_positions = []
+
+        # Pre-order traversal
+        if tree.root is not None:
+            stack = [(tree.root, -1,)]
+            while stack:
+                node_id, parent_position = stack.pop()
+                position = positions[node_id] = len(nodes)
+                node = tree[node_id]
+                nodes.append(node)
+                parent_positions.append(parent_position)
+                roles.setdefault(node.data.role, []).append(position)
+                poss.setdefault(node.data.pos, []).append(position)
+                for child_id in reversed(tree._child_ids(node_id)):  # pylint: disable=protected-access
+                    stack.append((child_id, position,))
+
+        # The end positions of the subtrees (children before parents)
+        self._ends = ends = [position+1 for position in range(len(nodes))]
+        for position in reversed(range(1, len(nodes))):
+            parent_position = parent_positions[position]
+            ends[parent_position] = max(ends[parent_position], ends[position])
+
+        self._pos_tags = sorted(pos for pos in poss if pos is not None)
+
+    def find(self, root_id=None, *, role=None, role_in=None, pos=None, pos_in=None, pos_prefix=None):
+        """Find the nodes matching all the given conditions (same as :meth:`ParseTree.find`)."""
+        if root_id is None:
+            start, end = 0, len(self.nodes)
+        else:
+            start = self._positions[root_id]
+            end = self._ends[start]
+
+        conditions = []
+        if role is not None:
+            conditions.append((self.roles, (role,),))
+        if role_in is not None:
+            conditions.append((self.roles, role_in,))
+        if pos is not None:
+            conditions.append((self.poss, (pos,),))
+        if pos_in is not None:
+            conditions.append((self.poss, pos_in,))
+        if pos_prefix is not None:
+            idx = _bisect_left(self._pos_tags, pos_prefix)
+            pos_tags = []
+            while idx < len(self._pos_tags) and self._pos_tags[idx].startswith(pos_prefix):
+                pos_tags.append(self._pos_tags[idx])
+                idx += 1
+            conditions.append((self.poss, pos_tags,))
+
+        found = None
+        for index, keys in conditions:
+            matched = set()
+            for key in keys:
+                key_positions = index.get(key)
+                if key_positions:
+                    matched.update(key_positions[_bisect_left(key_positions, start):_bisect_left(key_positions, end)])
+            found = matched if found is None else found & matched
+
+        return [self.nodes[position] for position in (range(start, end) if found is None else sorted(found))]
+
+def _find_head_idxs(roles, *, semantic):
+    """Find the indices of the head children of a non-leaf node from the roles of its children.
+
+    (see :meth:`ParseTree.get_heads` with **deep** = `False`)
+    """
+    if semantic:
+        idxs = [idx for idx, role in enumerate(roles) if role in ('DUMMY', 'DUMMY1', 'DUMMY2',)]
+        if idxs:
+            return idxs
+
+        idxs = [idx for idx, role in enumerate(roles) if role == 'head']
+        if idxs:
+            return idxs
+
+    idxs = [idx for idx, role in enumerate(roles) if role == 'Head']
+    if idxs:
+        return idxs
+
+    return [len(roles)-1]
@@ -9,6 +9,8 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import re as _re
+
 from abc import (
     ABCMeta as _ABCMeta,
     abstractmethod as _abstractmethod,
@@ -49,6 +51,21 @@ def _paragraph_from_text(data):
     """Iterable[str] -> Tuple[Iterable[Iterable[str]], Iterable[Iterable[str]]]"""
     return zip(*map(_sentence_from_text, data))
 
+# Same as `_token_from_text` on each token: strip whitespaces and ')'s, and split at the last '('
+_TOKEN_PATTERN = _re.compile(r'[^\S\u3000]*\)*([^\u3000]*)\(([^(\u3000]*?)\)*[^\S\u3000]*(?:\u3000|\Z)')
+
+def _sentence_from_text_fast(data):
+    """str -> Tuple[List[str], List[str]]"""
+    tokens = _TOKEN_PATTERN.findall(data)
+    if len(tokens) == data.count('\u3000') + 1:
+        return [word for word, _ in tokens], [pos for _, pos in tokens]
+
+    # Fallback for irregular tokens
+    columns = tuple(_sentence_from_text(data))
+    if len(columns) != 2:
+        raise ValueError(f'Invalid word-segmented and part-of-speech sentence: {data!r}')
+    return list(columns[0]), list(columns[1])
+
 def _paragraph_to_text(data):
     """Tuple[Iterable[Iterable[str]], Iterable[Iterable[str]]] -> Iterable[str]"""
     return map(_sentence_to_text, zip(*data))
@@ -153,6 +170,9 @@ class WsPosSentence(metaclass=_ABCMeta):
             :class:`~ckipnlp.container.seg.SegSentence`
                 the POS-tag sentence.
         """
+        tokens = _TOKEN_PATTERN.findall(data)
+        if len(tokens) == data.count('\u3000') + 1:
+            return tuple(map(_SegSentence.from_list, zip(*tokens)))
         return tuple(map(_SegSentence.from_list, _sentence_from_text(data)))
 
     @staticmethod
@@ -200,7 +220,7 @@ class WsPosParagraph(metaclass=_ABCMeta):
             :class:`~.seg.SegParagraph`:
                 the POS-tag sentence list.
         """
-        return tuple(map(_SegParagraph.from_list, _paragraph_from_text(data)))
+        return WsPosDecoder().feed(data).result()
 
     @staticmethod
     def to_text(word, pos):
@@ -219,3 +239,64 @@ class WsPosParagraph(metaclass=_ABCMeta):
                 list of sentences such as ``'中文字(Na)\\u3000耶(T)'``.
         """
         return list(_paragraph_to_text((word, pos,)))
+
+################################################################################################################################
+
+class WsPosDecoder:
+    """The incremental decoder of word-segmented and part-of-speech sentence lists in text format.
+
+    Each sentence is decoded by a single regular-expression pass,
+    and the results are appended into the word and POS-tag sentence lists directly.
+
+    Attributes
+    ----------
+        word : :class:`~.seg.SegParagraph`
+            the word sentence list decoded so far.
+        pos : :class:`~.seg.SegParagraph`
+            the POS-tag sentence list decoded so far.
+
+    .. code-block:: python
+
+        decoder = WsPosDecoder()
+        for chunk in chunks:  # e.g. [ '中文字(Na)\u3000耶(T)', ... ]
+            decoder.feed(chunk)
+        word, pos = decoder.result()
+    """
+
+    def __init__(self):
+        self.word = _SegParagraph()
+        self.pos = _SegParagraph()
+
+    def __len__(self):
+        return len(self.word)
+
+    def feed(self, data):
+        """Decode sentences and append them to the results.
+
+        Parameters
+        ----------
+            data : Iterable[str]
+                list of sentences such as ``'中文字(Na)\\u3000耶(T)'``.
+
+        Returns
+        -------
+            :class:`WsPosDecoder`
+                this decoder.
+        """
+        for line in data:
+            word, pos = _sentence_from_text_fast(line)
+            self.word.append(_SegSentence(word))
+            self.pos.append(_SegSentence(pos))
+        return self
+
+    def result(self):
+        """Get the decoded results.
+
+        Returns
+        -------
+            :class:`~.seg.SegParagraph`:
+                the word sentence list
+            :class:`~.seg.SegParagraph`:
+                the POS-tag sentence list.
+        """
+        return self.word, self.pos
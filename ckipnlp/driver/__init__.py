@@ -17,8 +17,10 @@ from .tagger import (
 
 from .classic import (
     CkipClassicWordSegmenter,
+    CkipClassicWordSegmenterPool,
     CkipClassicConParser,
     CkipClassicConParserClient,
+    CkipClassicConParserPool,
 )
 
 from .ss import (
@@ -27,4 +29,5 @@ from .ss import (
 
 from .coref import (
     CkipCorefChunker,
+    CorefState,
 )
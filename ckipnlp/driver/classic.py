@@ -13,16 +13,20 @@ from abc import (
     abstractmethod as _abstractmethod,
 )
 
-from itertools import (
-    chain as _chain,
-)
+import multiprocessing as _mp
+import os as _os
 
 from ckipnlp.container import (
     TextParagraph as _TextParagraph,
     SegParagraph as _SegParagraph,
     WsPosSentence as _WsPosSentence,
-    WsPosParagraph as _WsPosParagraph,
+    WsPosDecoder as _WsPosDecoder,
     ParseParagraph as _ParseParagraph,
+    segment_clauses as _segment_clauses,
+)
+
+from ckipnlp.util.normalize import (
+    half2full as _half2full,
 )
 
 from .base import (
@@ -31,6 +35,33 @@ from .base import (
 
 ################################################################################################################################
 
+class _CkipClassicPoolMixin:
+    """The mixin of the drivers with a multi-process CkipClassic backend.
+
+    The worker processes are shut down by :meth:`close`, or when leaving the ``with`` block.
+    """
+
+    def __enter__(self):
+        self.init()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, '_core', None) is not None:
+            self._core.terminate()
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._core is not None:
+            self._core.close()
+            self._core.join()
+            self._core = None
+            self._inited = False
+
+################################################################################################################################
+
 class CkipClassicWordSegmenter(_BaseDriver):
     """The CKIP word segmentation driver with CkipClassic backend.
 
@@ -63,9 +94,9 @@ class CkipClassicWordSegmenter(_BaseDriver):
     _count = 0
 
     def __init__(self, *, lazy=False, do_pos=False, lexicons=None):
-        super().__init__(lazy=lazy)
         self._do_pos = do_pos
         self._lexicons = lexicons
+        super().__init__(lazy=lazy)
 
     def _init(self):
         self.__class__._count += 1  # pylint: disable=protected-access
@@ -81,11 +112,23 @@ class CkipClassicWordSegmenter(_BaseDriver):
     def _call(self, *, text):
         assert isinstance(text, _TextParagraph)
 
-        wspos_text = self._core.apply_list(text.to_text())
-        ws, pos = _WsPosParagraph.from_text(wspos_text)
+        decoder = _WsPosDecoder()
+        for wspos_text in self._apply_list(text.to_text()):
+            decoder.feed(wspos_text)
+        ws, pos = decoder.result()
 
         return (ws, pos,) if self._do_pos else ws
 
+    def _apply_list(self, text_list):
+        """Apply word segmentation.
+
+        Yields
+        ------
+            List[str]
+                the chunks of word-segmented and part-of-speech sentences in text format.
+        """
+        yield self._core.apply_list(text_list)
+
 class _CkipClassicWordSegmenter(CkipClassicWordSegmenter):
     """The dummy class for :class:`CkipClassicWordSegmenter` for pipeline."""
 
@@ -113,6 +156,9 @@ class _CkipClassic2WordSegmenter(_BaseDriver):
     driver_family = '_classic'
     driver_inputs = ('_wspos',)
 
+    def __init__(self, *, lazy=False, **_opts):  # the options are used by the '_wspos' driver
+        super().__init__(lazy=lazy)
+
     def _init(self):
         pass
 
@@ -126,6 +172,9 @@ class _CkipClassic2PosTagger(_BaseDriver):
     driver_family = '_classic'
     driver_inputs = ('_wspos',)
 
+    def __init__(self, *, lazy=False, **_opts):  # the options are used by the '_wspos' driver
+        super().__init__(lazy=lazy)
+
     def _init(self):
         pass
 
@@ -134,12 +183,122 @@ class _CkipClassic2PosTagger(_BaseDriver):
 
 ################################################################################################################################
 
-class _CkipClassicConParser(_BaseDriver):
+_pool_ws_core = None   # the backend instance of the pool worker process
+_pool_ws_error = None  # the initialization error of the pool worker process
+
+def _init_ws_worker(lexicons):
+    global _pool_ws_core, _pool_ws_error  # pylint: disable=global-statement
+    try:
+        import ckip_classic.ws
+        _pool_ws_core = ckip_classic.ws.CkipWs(
+            new_style_format=True,
+            lex_list=lexicons,
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        _pool_ws_error = exc  # raised by the tasks, since the pool respawns the workers with failed initializers forever
+
+def _apply_ws_worker(text_list):
+    if _pool_ws_error is not None:
+        raise _pool_ws_error
+    return list(_pool_ws_core.apply_list(text_list))
+
+class CkipClassicWordSegmenterPool(_CkipClassicPoolMixin, CkipClassicWordSegmenter):
+    """The CKIP word segmentation driver with a multi-process CkipClassic backend.
+
+    Arguments
+    ---------
+        lazy : bool
+            Lazy initialize the driver.
+        do_pos : bool
+            Returns POS-tag or not
+        lexicons: Iterable[Tuple[str, str]]
+            A list of the lexicon words and their POS-tags.
+        workers : int
+            The number of worker processes. (Use the number of CPUs if not set.)
+        chunksize : int
+            The number of sentences sent to a worker process at once.
+            (Split the sentences evenly across the workers if not set.)
+
+    Notes
+    -----
+        Each worker process owns its own CkipClassic word segmenter loaded with the same **lexicons**.
+
+        Call :meth:`close` (or use the driver as a context manager) to shut down the worker processes.
+        The errors of loading the word segmenter in the workers are raised by the calls.
+
+    .. method:: __call__(*, text)
+
+        Apply word segmentation.
+
+        Parameters
+            **text** (:class:`TextParagraph <ckipnlp.container.text.TextParagraph>`) — The sentences.
+
+        Returns
+            - **ws** (:class:`TextParagraph <ckipnlp.container.text.TextParagraph>`) — The word-segmented sentences.
+            - **pos** (:class:`TextParagraph <ckipnlp.container.text.TextParagraph>`) — The part-of-speech sentences.
+              (returns if **do_pos** is set.)
+    """
+
+    driver_type = None
+    driver_family = 'classic-pool'
+    driver_inputs = None
+
+    def __init__(self, *, lazy=False, do_pos=False, lexicons=None, workers=None, chunksize=None):
+        self._workers = workers or _os.cpu_count() or 1
+        self._chunksize = chunksize
+        super().__init__(lazy=lazy, do_pos=do_pos, lexicons=list(lexicons) if lexicons is not None else None)
+
+    def _init(self):
+        import ckip_classic.ws  # pylint: disable=unused-import  # fail fast if the backend is not installed
+        self._core = _mp.Pool(self._workers, initializer=_init_ws_worker, initargs=(self._lexicons,))
+
+    def _apply_list(self, text_list):
+        chunksize = self._chunksize or -(-len(text_list) // self._workers) or 1
+        return self._core.imap(_apply_ws_worker, (
+            text_list[idx:idx+chunksize] for idx in range(0, len(text_list), chunksize)
+        ))
+
+class _CkipClassicWordSegmenterPool(CkipClassicWordSegmenterPool):
+    """The dummy class for :class:`CkipClassicWordSegmenterPool` for pipeline."""
+
+    driver_type = 'word_segmenter'
+    driver_family = 'classic-pool'
+    driver_inputs = ('text',)
+
+    def __init__(self, *, lazy=False, lexicons=None, workers=None, chunksize=None):
+        super().__init__(lazy=lazy, do_pos=False, lexicons=lexicons, workers=workers, chunksize=chunksize)
+
+class _CkipClassicPool2WsPos(CkipClassicWordSegmenterPool):
+    """The dummy class for :class:`CkipClassicWordSegmenterPool` for pipeline."""
+
+    driver_type = '_wspos'
+    driver_family = '_classic-pool'
+    driver_inputs = ('text',)
+
+    def __init__(self, *, lazy=False, lexicons=None, workers=None, chunksize=None):
+        super().__init__(lazy=lazy, do_pos=True, lexicons=lexicons, workers=workers, chunksize=chunksize)
 
+class _CkipClassicPool2WordSegmenter(_CkipClassic2WordSegmenter):
+    """The dummy class for :class:`CkipClassicWordSegmenterPool` for pipeline."""
+
+    driver_family = '_classic-pool'
+
+class _CkipClassicPool2PosTagger(_CkipClassic2PosTagger):
+    """The dummy class for :class:`CkipClassicWordSegmenterPool` for pipeline."""
+
+    driver_family = '_classic-pool'
+
+################################################################################################################################
+
+class _CkipClassicConParser(_BaseDriver):
 
     driver_type = 'con_parser'
     driver_inputs = ('ws', 'pos',)
 
+    def __init__(self, *, lazy=False, cache=None):
+        self._cache = cache
+        super().__init__(lazy=lazy)
+
     @_abstractmethod
     def driver_family(self):  # pylint: disable=missing-docstring
         return NotImplemented
@@ -152,51 +311,83 @@ class _CkipClassicConParser(_BaseDriver):
         assert isinstance(ws, _SegParagraph)
         assert isinstance(pos, _SegParagraph)
 
+        # Segment clauses
+        wspos_text_list = []
+        for ws_sent, pos_sent, clauses in zip(ws, pos, _segment_clauses(ws=ws, pos=pos)):
+            wspos_sent_text = []
+            for clause in clauses:
+                if clause.idxs:
+                    wspos_sent_text.append((True, _WsPosSentence.to_text(
+                        _half2full.normalize_list([ws_sent[idx] for idx in clause.idxs]),
+                        [pos_sent[idx] for idx in clause.idxs],
+                    ),))
+                if clause.delim:
+                    wspos_sent_text.append((False, clause.delim,))
+
+            wspos_text_list.append(wspos_sent_text)
+
+        # Parse clauses
+        clause2conparse = self._parse(
+            wspos_text for wspos_sent_text in wspos_text_list for is_clause, wspos_text in wspos_sent_text if is_clause
+        )
 
+        # Merge results
         conparse_text = []
-        for ws_sent, pos_sent in zip(ws, pos):
+        for wspos_sent_text in wspos_text_list:
             conparse_sent_text = []
-            ws_clause = []
-            pos_clause = []
-            for ws_token, pos_token in _chain(zip(ws_sent, pos_sent), [(None, None),]):
-
-                # Skip WHITESPACE
-                if pos_token == 'WHITESPACE':
-                    continue
-
-                # Segment clauses by punctuations
-                if pos_token is None or (pos_token.endswith('CATEGORY') and pos_token != 'PAUSECATEGORY'):
-                    if ws_clause:
-                        wspos_clause_text = _WsPosSentence.to_text(ws_clause, pos_clause)
-                        for conparse_clause_text in self._core.apply_list([wspos_clause_text]):
-                            conparse_sent_text.append([self._normalize(conparse_clause_text), '',])
-
-                    if ws_token:
-                        if not conparse_sent_text:
-                            conparse_sent_text.append([None, '',])
-                        conparse_sent_text[-1][1] += ws_token
-
-                    ws_clause = []
-                    pos_clause = []
-
+            for is_clause, wspos_text in wspos_sent_text:
+                if is_clause:
+                    for conparse_clause_text in clause2conparse[wspos_text]:
+                        conparse_sent_text.append([conparse_clause_text, '',])
                 else:
-                    ws_clause.append(self._half2full(ws_token))
-                    pos_clause.append(pos_token)
+                    if not conparse_sent_text:
+                        conparse_sent_text.append([None, '',])
+                    conparse_sent_text[-1][1] += wspos_text
 
             conparse_text.append(conparse_sent_text)
         conparse = _ParseParagraph.from_list(conparse_text)
 
         return conparse
 
-    @staticmethod
-    def _half2full(text):
-        return text \
-           .replace('(', '（') \
-           .replace(')', '）') \
-           .replace('+', '＋') \
-           .replace('-', '－') \
-           .replace(':', '：') \
-           .replace('|', '｜')
+    def _parse(self, wspos_clause_texts):
+        """Parse the clauses (without duplicates), using the cache if provided.
+
+        Returns
+        -------
+            Dict[str, List[str]]
+                A mapping from the clauses in text format to the lists of normalized parsed clauses.
+        """
+        clause2conparse = {}
+        missing_clause_texts = []
+        for wspos_clause_text in wspos_clause_texts:
+            if wspos_clause_text in clause2conparse:
+                continue
+
+            conparse_clause_texts = self._cache.get(wspos_clause_text) if self._cache is not None else None
+            if conparse_clause_texts is None:
+                missing_clause_texts.append(wspos_clause_text)
+            clause2conparse[wspos_clause_text] = conparse_clause_texts
+
+        for wspos_clause_text, conparse_clause_texts in zip(
+            missing_clause_texts, self._apply_list(missing_clause_texts),
+        ):
+            conparse_clause_texts = list(map(self._normalize, conparse_clause_texts))
+            if self._cache is not None:
+                self._cache.put(wspos_clause_text, conparse_clause_texts)
+            clause2conparse[wspos_clause_text] = conparse_clause_texts
+
+        return clause2conparse
+
+    def _apply_list(self, wspos_clause_texts):
+        """Parse the clauses one by one.
+
+        Yields
+        ------
+            List[str]
+                the raw parsed clauses of each clause.
+        """
+        for wspos_clause_text in wspos_clause_texts:
+            yield self._core.apply_list([wspos_clause_text])
 
     @staticmethod
     def _normalize(text):
@@ -211,6 +402,8 @@ class CkipClassicConParser(_CkipClassicConParser):
     ---------
         lazy : bool
             Lazy initialize the driver.
+        cache : :class:`~ckipnlp.util.cache.ClauseCache`
+            (*optional*) The cache of parsed clauses.
 
     .. method:: __call__(*, ws, pos)
 
@@ -244,6 +437,8 @@ class CkipClassicConParserClient(_CkipClassicConParser):
     ---------
         lazy : bool
             Lazy initialize the driver.
+        cache : :class:`~ckipnlp.util.cache.ClauseCache`
+            (*optional*) The cache of parsed clauses.
         username : string
             (*optional*) The username of CkipClassicParserClient.
         password : string
@@ -270,11 +465,82 @@ class CkipClassicConParserClient(_CkipClassicConParser):
 
     driver_family = 'classic-client'
 
-    def __init__(self, *, lazy=False, **opts):
-        super().__init__(lazy=lazy)
+    def __init__(self, *, lazy=False, cache=None, **opts):
         self._opts = opts
+        super().__init__(lazy=lazy, cache=cache)
 
     def _init(self):
 
         import ckip_classic.client
         self._core = ckip_classic.client.CkipParserClient(**self._opts)
+
+################################################################################################################################
+
+_pool_core = None   # the backend instance of the pool worker process
+_pool_error = None  # the initialization error of the pool worker process
+
+def _init_parser_worker():
+    global _pool_core, _pool_error  # pylint: disable=global-statement
+    try:
+        import ckip_classic.parser
+        _pool_core = ckip_classic.parser.CkipParser(do_ws=False)
+    except Exception as exc:  # pylint: disable=broad-except
+        _pool_error = exc  # raised by the tasks, since the pool respawns the workers with failed initializers forever
+
+def _apply_parser_worker(wspos_clause_text):
+    if _pool_error is not None:
+        raise _pool_error
+    return list(_pool_core.apply_list([wspos_clause_text]))
+
+class CkipClassicConParserPool(_CkipClassicPoolMixin, _CkipClassicConParser):
+    """The CKIP constituency parsing driver with a multi-process CkipClassic backend.
+
+    Arguments
+    ---------
+        lazy : bool
+            Lazy initialize the driver.
+        cache : :class:`~ckipnlp.util.cache.ClauseCache`
+            (*optional*) The cache of parsed clauses.
+        workers : int
+            The number of worker processes. (Use the number of CPUs if not set.)
+        chunksize : int
+            The number of clauses sent to a worker process at once.
+
+    Notes
+    -----
+        Each worker process owns its own CkipClassic parser.
+        The clauses are sent to the workers through a shared task queue, and the results are gathered in order.
+
+        Call :meth:`close` (or use the driver as a context manager) to shut down the worker processes.
+        The errors of loading the parser in the workers are raised by the calls.
+
+    .. code-block:: python
+
+        with CkipClassicConParserPool(workers=4) as con_parser:
+            conparse = con_parser(ws=ws, pos=pos)
+
+    .. method:: __call__(*, ws, pos)
+
+        Apply constituency parsing.
+
+        Parameters
+            - **ws** (:class:`~ckipnlp.container.text.TextParagraph`) — The word-segmented sentences.
+            - **pos** (:class:`~ckipnlp.container.text.TextParagraph`) — The part-of-speech sentences.
+
+        Returns
+            **conparse** (:class:`~ckipnlp.container.parse.ParseSentence`) — The constituency-parsing sentences.
+    """
+
+    driver_family = 'classic-pool'
+
+    def __init__(self, *, lazy=False, cache=None, workers=None, chunksize=1):
+        self._workers = workers
+        self._chunksize = chunksize
+        super().__init__(lazy=lazy, cache=cache)
+
+    def _init(self):
+        import ckip_classic.parser  # pylint: disable=unused-import  # fail fast if the backend is not installed
+        self._core = _mp.Pool(self._workers, initializer=_init_parser_worker)
+
+    def _apply_list(self, wspos_clause_texts):
+        return self._core.imap(_apply_parser_worker, wspos_clause_texts, chunksize=self._chunksize)
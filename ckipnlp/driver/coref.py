@@ -11,8 +11,8 @@ __license__ = 'GPL-3.0'
 
 import numpy as _np
 
-from treelib import (
-    Tree as _Tree,
+from itertools import (
+    chain as _chain,
 )
 
 from ckipnlp.container import (
@@ -23,6 +23,7 @@ from ckipnlp.container import (
     CorefToken as _CorefToken,
     CorefSentence as _CorefSentence,
     CorefParagraph as _CorefParagraph,
+    segment_clauses as _segment_clauses,
 )
 
 from ckipnlp.data.conparse import (
@@ -41,6 +42,251 @@ from .base import (
 
 ################################################################################################################################
 
+HUMAN_FLAG = 0x1    #: The word class flag of human words.
+PRONOUN_FLAG = 0x2  #: The word class flag of 3rd-person pronouns.
+SELF_FLAG = 0x4     #: The word class flag of reflexive words.
+
+class _WordClassifier:
+    """The word classifier for coreference candidates.
+
+    A word is classified into bit flags by its word and POS-tag:
+
+    * :data:`HUMAN_FLAG`: POS-tag is `Nb`, or POS-tag is `N*` and the word is one of the human words.
+    * :data:`PRONOUN_FLAG`: POS-tag is `Nh`, or POS-tag is `N*` and the word is one of the pronoun words.
+    * :data:`SELF_FLAG`: the word is one of the self words.
+    """
+
+    def __init__(self, *, human_words, pronoun_words, self_words):
+        self._word2flags = {}  # word => flags
+        for words, flag in ((human_words, HUMAN_FLAG,), (pronoun_words, PRONOUN_FLAG,), (self_words, SELF_FLAG,),):
+            for word in words:
+                self._word2flags[word] = self._word2flags.get(word, 0) | flag
+
+        self._pos2flags = {}  # POS-tag => (forced flags, mask of word flags)
+
+    def _pos_flags(self, pos):
+        try:
+            return self._pos2flags[pos]
+        except KeyError:
+            forced = (HUMAN_FLAG if pos.startswith('Nb') else 0) | (PRONOUN_FLAG if pos.startswith('Nh') else 0)
+            mask = SELF_FLAG | (HUMAN_FLAG | PRONOUN_FLAG if pos.startswith('N') else 0)
+            self._pos2flags[pos] = (forced, mask,)
+            return forced, mask
+
+    def __call__(self, word, pos):
+        forced, mask = self._pos_flags(pos)
+        return forced | (self._word2flags.get(word, 0) & mask)
+
+_classify_word = _WordClassifier(
+    human_words=_HUMAN_WORDS,
+    pronoun_words=_PRONOUN_3RD_WORDS,
+    self_words=_SELF_WORDS,
+)
+
+def _has_zero_subject(pos_list):
+    """Check if a clause starts with a verb (after adverbs and conjunctions only), i.e. its subject is omitted."""
+    for pos in pos_list:
+        if pos.startswith('V') or pos == 'SHI':
+            return True
+        if not pos.startswith(('D', 'Cb',)) or pos == 'DE':
+            return False
+    return False
+
+################################################################################################################################
+
+def _flat_word_ends(ws, line_starts, *, word_counts=None):
+    """Get the flat positions of the word ends.
+
+    Returns
+    -------
+        numpy.ndarray
+            the flat positions (line start + offset in line) of the ends of all words.
+        numpy.ndarray
+            the index of the first word of each line.
+    """
+    if word_counts is None:
+        word_counts = _np.fromiter(map(len, ws), dtype=_np.int64, count=len(ws))
+    word_offsets = _np.concatenate([[0], _np.cumsum(word_counts)])
+    word_lens = _np.fromiter(map(len, _chain.from_iterable(ws)), dtype=_np.int64, count=word_offsets[-1])
+
+    cum_lens = _np.concatenate([[0], _np.cumsum(word_lens)])
+    line_ids = _np.repeat(_np.arange(len(ws)), word_counts)
+    word_ends = line_starts[line_ids] + cum_lens[1:] - cum_lens[word_offsets[:-1]][line_ids]
+    return word_ends, word_offsets[:-1]
+
+class _CorefForest:
+    """The coreference forest of mentions.
+
+    Each tree is a coreference cluster, whose root is the source of the cluster.
+    The nodes are stored in parent-pointer arrays, which replaces :class:`treelib.Tree` with the same semantics.
+
+    Notes
+    -----
+        The nodes are finalized sentence by sentence (see :meth:`finalize`). A finalized node is never moved, and its
+        ancestors are all finalized. Therefore the clusters of the finalized nodes are fixed.
+    """
+
+    _ROOT = -1     # the parent of the roots
+    _REMOVED = -2  # the parent of the removed nodes
+
+    def __init__(self):
+        self._key2idx = {}   # mention key => node index
+        self._keys = []      # node index => mention key
+        self._parents = []   # node index => parent node index
+        self._sources = []   # node index => is source or not
+
+        self._roots = []     # finalized node index => root node index (negative for removed nodes)
+        self._root2ref = {}  # root node index => cluster index
+
+    def __contains__(self, key):
+        idx = self._key2idx.get(key)
+        return idx is not None and self._parents[idx] != self._REMOVED
+
+    def create_node(self, key, *, parent, is_source):
+        """Add a mention under **parent** (as a new root if `None`)."""
+        assert key not in self._key2idx, f'{key} already exists!'
+        self._key2idx[key] = len(self._keys)
+        self._keys.append(key)
+        self._parents.append(self._ROOT if parent is None else self._key2idx[parent])
+        self._sources.append(is_source)
+
+    def is_source(self, key):  # pylint: disable=missing-docstring
+        return self._sources[self._key2idx[key]]
+
+    def is_ancestor(self, ancestor, key):
+        """Check if **ancestor** is a proper ancestor of **key**."""
+        ancestor_idx = self._key2idx[ancestor]
+        num_final = len(self._roots)
+        parents = self._parents
+        idx = parents[self._key2idx[key]]
+        while idx >= 0:
+            if idx == ancestor_idx:
+                return True
+            if idx < num_final <= ancestor_idx:  # the ancestors of a finalized node are all finalized
+                return False
+            idx = parents[idx]
+        return False
+
+    def move_node(self, key, parent):
+        """Move a mention (and its descendants) under **parent**."""
+        idx = self._key2idx[key]
+        assert idx >= len(self._roots), f'Can not move finalized {key}!'
+        assert key != parent and not self.is_ancestor(key, parent), f'Can not move {key} under its descendant!'
+        self._parents[idx] = self._key2idx[parent]
+
+    def remove_tree(self, key):
+        """Remove a mention and its descendants."""
+        self._parents[self._key2idx[key]] = self._REMOVED
+
+    def finalize(self):
+        """Finalize the new nodes, and get their clusters.
+
+        The clusters are indexed by the creation order of their roots.
+
+        Returns
+        -------
+            Dict[Hashable, int]
+                The mention key => the cluster index of the new nodes (except the removed ones).
+            Set[Hashable]
+                The keys of the new roots.
+        """
+        parents = self._parents
+        roots = self._roots
+        num_final = len(roots)
+        roots.extend([None] * (len(parents) - num_final))
+
+        for idx in range(num_final, len(parents)):
+            path = []
+            while roots[idx] is None and parents[idx] >= 0:
+                path.append(idx)
+                idx = parents[idx]
+            root = roots[idx] if roots[idx] is not None else (idx if parents[idx] == self._ROOT else self._REMOVED)
+            roots[idx] = root
+            for path_idx in path:
+                roots[path_idx] = root
+
+        new_roots = []
+        for idx in range(num_final, len(parents)):
+            if parents[idx] == self._ROOT:
+                self._root2ref[idx] = len(self._root2ref)
+                new_roots.append(idx)
+
+        keys = self._keys
+        root2ref = self._root2ref
+        node2coref = {keys[idx]: root2ref[roots[idx]] for idx in range(num_final, len(parents)) if roots[idx] >= 0}
+        sources = {keys[idx] for idx in new_roots}
+        return node2coref, sources
+
+################################################################################################################################
+
+_DUMMY_KEY = (-1, -1, -1)  # the parent of the targets without sources (removed)
+
+class CorefState:
+    """The incremental coreference resolution state.
+
+    The state keeps the clusters and the linking context of the processed sentences,
+    so that the sentences of a streaming document can be resolved one by one.
+
+    Attributes
+    ----------
+        num_sents : int
+            The number of processed sentences.
+        name2node : Dict[str, Tuple]
+            The first source mention of each name.
+        curr_source : Tuple
+            The current coreference source.
+        last_source : Tuple
+            The last coreference source.
+        last_subject : Tuple
+            The last coreference subject.
+        last_sent_pos : str
+            The POS-tag of the last clause.
+
+    .. code-block:: python
+
+        state = CorefState()
+        for sent in sents:  # ParseSentence
+            coref_sent = state.update(sent)  # CorefSentence
+
+    Notes
+    -----
+        The results are the same as applying :class:`CkipCorefChunker` on the whole document,
+        and the cost of each sentence does not depend on the number of processed sentences.
+    """
+
+    def __init__(self):
+        self.num_sents = 0
+        self.name2node = {}  # name => ((sent_id, clause_id,), (node_id, is_prepend))
+
+        self.curr_source = None    # the current coref source
+        self.last_source = None    # the last coref source
+        self.last_subject = None   # the last coref subject
+
+        self.last_sent_pos = None  # the POS-tag of last sentence
+
+        self.forest = _CorefForest()
+        self.forest.create_node(_DUMMY_KEY, parent=None, is_source=True)
+        self.forest.remove_tree(_DUMMY_KEY)
+
+    def update(self, sent, *, unparsed=()):
+        """Resolve coreference of a new sentence.
+
+        Parameters
+        ----------
+            sent : :class:`~ckipnlp.container.parse.ParseSentence`
+                The constituency-parsing sentence.
+            unparsed : Collection[int]
+                (*optional*) The IDs of the clauses with words left unparsed (see :meth:`CkipCorefChunker.mark_clauses`).
+
+        Returns
+        -------
+            :class:`~ckipnlp.container.coref.CorefSentence`
+                The coreference results of this sentence.
+        """
+        return CkipCorefChunker._update(self, sent, unparsed=unparsed)  # pylint: disable=protected-access
+
+################################################################################################################################
+
 class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
     """The CKIP coreference resolution driver.
 
@@ -49,15 +295,24 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
         lazy : bool
             Lazy initialize the driver.
 
-    .. method:: __call__(*, conparse)
+    .. method:: __call__(*, conparse, unparsed=None)
 
         Apply coreference delectation.
 
         Parameters
-            **conparse** (:class:`~ckipnlp.container.parse.ParseParagraph`) — The constituency-parsing sentences.
+            - **conparse** (:class:`~ckipnlp.container.parse.ParseParagraph`) — The constituency-parsing sentences.
+            - **unparsed** (*List[Collection[int]]*) — (*optional*) The IDs of the clauses with words left unparsed
+              in each sentence (see :meth:`mark_clauses`). These clauses end the context of the last subject.
 
         Returns
             **coref** (:class:`~ckipnlp.container.coref.CorefParagraph`) — The coreference results.
+
+    Note
+    ----
+        The clauses are resolved on their cached :attr:`~ckipnlp.container.parse.ParseClause.tree`, which is a
+        read-only :class:`~ckipnlp.container.util.parse_tree.CompactParseTree` (not a
+        :class:`~ckipnlp.container.util.parse_tree.ParseTree`). The subclasses overriding the tree methods receive
+        these trees.
     """
 
     driver_type = 'coref_chunker'
@@ -67,234 +322,342 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
     def _init(self):
         pass
 
-    def _call(self, *, conparse):
+    def _call(self, *, conparse, unparsed=None):
         assert isinstance(conparse, _ParseParagraph)
 
-        # Convert to tree structure
-        tree_list = [
-            [
-                (clause.to_tree(), clause.delim,)
-                for clause in sent
-            ] for sent in conparse
-        ]
-
-        # Find coreference
-        coref_tree = self._get_coref(tree_list)
-
-        # # Get results
-        coref = self._get_result(tree_list, coref_tree=coref_tree)
+        if unparsed is None:
+            unparsed = [()] * len(conparse)
 
-        return coref
+        state = CorefState()
+        return _CorefParagraph(
+            self._update(state, sent, unparsed=unparsed_ids) for sent, unparsed_ids in zip(conparse, unparsed)
+        )
 
     ########################################################################################################################
 
     @classmethod
-    def _get_coref(cls, tree_list):
-
-        coref_tree = _Tree()
-        coref_tree.create_node(identifier=0)
-        dummy_id = (-1, -1, -1)
-        coref_tree.create_node(identifier=dummy_id, parent=0, data=True)
-
-        name2node = {}  # name => ((sent_id, clause_id,), (node_id, is_prepend))
-
-        curr_source = None    # the current coref source
-        last_source = None    # the last coref source
-        last_subject = None   # the last coref subject
-
-        last_sent_pos = None  # the POS-tag of last sentence
-
-        # Find coref
-        for sent_id, clause_list in enumerate(tree_list):
-            for clause_id, (tree, _) in enumerate(clause_list):
-                tree_key = (sent_id, clause_id,)
-
-                if tree is None:
-                    continue
-                curr_sent_pos = tree[tree.root].data.pos
-
-                # Get relations
-                appositions = []
-                for rel in tree.get_relations():
-                    if rel.relation.data.role in _APPOSITION_ROLES:
-                        appositions.append(((rel.head.identifier, False), (rel.tail.identifier, False),))
-
-                # Get sources/targets
-                node_keys = {}
-                for node_key in cls._get_sources(tree): # Source
-                    node_keys[node_key] = True
-                for node_key in cls._get_targets(tree): # Target
-                    node_keys[node_key] = False
-                subject_keys = set(cls._get_subjects(tree)) # Subject
-
-                for node_key, ntype in sorted(node_keys.items()):
-                    if ntype: # Assign ref_id to sources
-                        source = tree[node_key[0]]
-                        curr_source = (tree_key, node_key,)
-
-                        parent_id = name2node.get(source.data.word, None)
-                        if parent_id:
-                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=parent_id, data=True)
-                        else:
-                            name2node[source.data.word] = (tree_key, node_key,)
-                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=0, data=True)
-
-                    else: # Link targets to previous sources
-                        if node_key[1] and last_subject:
-                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=last_subject, data=False)
-                        if not node_key[1]:
-                            if curr_source and tree[node_key[0]].data.word in _SELF_WORDS:
-                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=curr_source, data=False)
-                            elif last_source:
-                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=last_source, data=False)
-                            else:
-                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=dummy_id, data=False)
-
-                # Merge apposition (apposition role)
-                for head_key, tail_key in appositions:
-                    head_key = (tree_key, head_key,)
-                    tail_key = (tree_key, tail_key,)
-
-                    if coref_tree.contains(head_key) and coref_tree.contains(tail_key):
-                        if coref_tree.is_ancestor(head_key, tail_key) or \
-                           coref_tree.is_ancestor(tail_key, head_key):
-                            continue
-
-                        if coref_tree[head_key].data:  # Head is a source
-                            coref_tree.move_node(tail_key, head_key)
-                        elif coref_tree[tail_key].data:  # Tail is a source
-                            coref_tree.move_node(head_key, tail_key)
-                        else:
-                            coref_tree.move_node(tail_key, head_key)
-
-                # Merge apposition (NP sentences)
-                if curr_sent_pos == 'NP' and last_sent_pos == 'NP' and last_subject:
-                    for node_key, ntype in node_keys.items():
-                        if ntype: # Merge sources only
-                            source_id = (tree_key, node_key,)
-                            if coref_tree.contains(source_id):
-                                coref_tree.move_node(source_id, last_subject)
-
-                # Update subject
-                if curr_sent_pos in ('NP', 'S'):
-                    last_subject = None
-                    for node_key, ntype in sorted(node_keys.items(), key=lambda x: x[::-1]):
-                        if node_key in subject_keys:
-                            last_subject = (tree_key, node_key,)
-                            break
-
-                # Update last
-                last_source = curr_source
-                last_sent_pos = curr_sent_pos
+    def _update(cls, state, sent, *, unparsed=()):
 
-        # Remove dummy node
-        coref_tree.remove_node(dummy_id)
+        # Convert to tree structure
+        clause_list = [(clause.tree, clause.delim,) for clause in sent]
+        sent_id = state.num_sents
 
-        return coref_tree
+        # Find coreference
+        cls._get_coref(state, sent_id, clause_list, unparsed=unparsed)
+        node2coref, sources = state.forest.finalize()
+        state.num_sents += 1
 
+        # Get results
+        return cls._get_result(sent_id, clause_list, node2coref=node2coref, sources=sources)
 
     @classmethod
-    def _get_result(cls, tree_list, *, coref_tree):
-
-        # Assign coref ID
-        node2coref = {}  # ((sent_id, clause_id,), (node_id, is_prepend)) => ref_id
-        sources = set()  # ((sent_id, clause_id,), (node_id, is_prepend))
+    def _get_coref(cls, state, sent_id, clause_list, *, unparsed=()):
+
+        coref_forest = state.forest
+        for clause_id, (tree, _) in enumerate(clause_list):
+            tree_key = (sent_id, clause_id,)
+
+            if tree is None:
+                if clause_id in unparsed:  # as if parsed as a subjectless S or NP
+                    state.last_subject = None
+                    state.last_sent_pos = None
+                continue
+            curr_sent_pos = tree[tree.root].data.pos
+
+            # Get relations
+            appositions = []
+            for rel in tree.analysis.relations:
+                if rel.relation.data.role in _APPOSITION_ROLES:
+                    appositions.append(((rel.head.identifier, False), (rel.tail.identifier, False),))
+
+            # Get sources/targets
+            leaf_flags = cls._classify_leaves(tree)
+            node_keys = {}
+            for node_key in cls._get_sources(tree, leaf_flags=leaf_flags): # Source
+                node_keys[node_key] = True
+            for node_key in cls._get_targets(tree, leaf_flags=leaf_flags): # Target
+                node_keys[node_key] = False
+            subject_keys = set(cls._get_subjects(tree)) # Subject
+
+            for node_key, ntype in sorted(node_keys.items()):
+                if ntype: # Assign ref_id to sources
+                    source = tree[node_key[0]]
+                    state.curr_source = (tree_key, node_key,)
+
+                    parent_id = state.name2node.get(source.data.word, None)
+                    if parent_id:
+                        coref_forest.create_node((tree_key, node_key,), parent=parent_id, is_source=True)
+                    else:
+                        state.name2node[source.data.word] = (tree_key, node_key,)
+                        coref_forest.create_node((tree_key, node_key,), parent=None, is_source=True)
+
+                else: # Link targets to previous sources
+                    if node_key[1] and state.last_subject:
+                        coref_forest.create_node((tree_key, node_key,), parent=state.last_subject, is_source=False)
+                    if not node_key[1]:
+                        if state.curr_source and leaf_flags[node_key[0]][1] & SELF_FLAG:
+                            coref_forest.create_node((tree_key, node_key,), parent=state.curr_source, is_source=False)
+                        elif state.last_source:
+                            coref_forest.create_node((tree_key, node_key,), parent=state.last_source, is_source=False)
+                        else:
+                            coref_forest.create_node((tree_key, node_key,), parent=_DUMMY_KEY, is_source=False)
+
+            # Merge apposition (apposition role)
+            for head_key, tail_key in appositions:
+                head_key = (tree_key, head_key,)
+                tail_key = (tree_key, tail_key,)
+
+                if head_key in coref_forest and tail_key in coref_forest:
+                    if coref_forest.is_ancestor(head_key, tail_key) or \
+                       coref_forest.is_ancestor(tail_key, head_key):
+                        continue
+
+                    if coref_forest.is_source(head_key):  # Head is a source
+                        coref_forest.move_node(tail_key, head_key)
+                    elif coref_forest.is_source(tail_key):  # Tail is a source
+                        coref_forest.move_node(head_key, tail_key)
+                    else:
+                        coref_forest.move_node(tail_key, head_key)
+
+            # Merge apposition (NP sentences)
+            if curr_sent_pos == 'NP' and state.last_sent_pos == 'NP' and state.last_subject:
+                for node_key, ntype in node_keys.items():
+                    if ntype: # Merge sources only
+                        source_id = (tree_key, node_key,)
+                        if source_id in coref_forest:
+                            coref_forest.move_node(source_id, state.last_subject)
+
+            # Update subject
+            if curr_sent_pos in ('NP', 'S'):
+                state.last_subject = None
+                for node_key, ntype in sorted(node_keys.items(), key=lambda x: x[::-1]):
+                    if node_key in subject_keys:
+                        state.last_subject = (tree_key, node_key,)
+                        break
+
+            # Update last
+            state.last_source = state.curr_source
+            state.last_sent_pos = curr_sent_pos
 
-        for ref_id, coref_source in enumerate(coref_tree.children(coref_tree.root)):
-            tree_key, node_key = coref_source.identifier
-            sources.add((tree_key, node_key,))
-            for tree_key, node_key in coref_tree.expand_tree(coref_source.identifier):
-                node2coref[tree_key, node_key] = ref_id
+    @classmethod
+    def _get_result(cls, sent_id, clause_list, *, node2coref, sources):
 
         # Generate result
-        tokens_list = _CorefParagraph()
-        for sent_id, clause_list in enumerate(tree_list):
-            tokens = _CorefSentence()
-            tokens_list.append(tokens)
-
-            for clause_id, (tree, delim,) in enumerate(clause_list):
-                tree_key = (sent_id, clause_id,)
-
-                if tree is not None:
-                    nodes = tree.leaves()
-
-                    for node in nodes:
-                        key = (tree_key, (node.identifier, True),)
-                        ref_id = node2coref.get(key, -1)
-                        if ref_id >= 0:
-                            tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
-                                word=None,
-                                idx=(clause_id, None,),
-                                coref=(ref_id, 'zero'),
-                            ))
-
-                        key = (tree_key, (node.identifier, False),)
-                        ref_id = node2coref.get(key, -1)
-                        if ref_id >= 0:
-                            tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
-                                word=node.data.word,
-                                idx=(clause_id, node.identifier,),
-                                coref=(ref_id, 'source' if key in sources else 'target',),
-                            ))
-                        else:
-                            tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
-                                word=node.data.word,
-                                idx=(clause_id, node.identifier,),
-                                coref=None,
-                            ))
-                if delim:
-                    tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
-                        word=delim,
-                        idx=(clause_id, None,),
-                        coref=None,
-                    ))
-
-        return tokens_list
+        tokens = _CorefSentence()
+        for clause_id, (tree, delim,) in enumerate(clause_list):
+            tree_key = (sent_id, clause_id,)
+
+            if tree is not None:
+                for node in tree.analysis.leaves:
+                    key = (tree_key, (node.identifier, True),)
+                    ref_id = node2coref.get(key, -1)
+                    if ref_id >= 0:
+                        tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
+                            word=None,
+                            idx=(clause_id, None,),
+                            coref=(ref_id, 'zero'),
+                        ))
+
+                    key = (tree_key, (node.identifier, False),)
+                    ref_id = node2coref.get(key, -1)
+                    if ref_id >= 0:
+                        tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
+                            word=node.data.word,
+                            idx=(clause_id, node.identifier,),
+                            coref=(ref_id, 'source' if key in sources else 'target',),
+                        ))
+                    else:
+                        tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
+                            word=node.data.word,
+                            idx=(clause_id, node.identifier,),
+                            coref=None,
+                        ))
+            if delim:
+                tokens.append(_CorefToken(  # pylint: disable=no-value-for-parameter
+                    word=delim,
+                    idx=(clause_id, None,),
+                    coref=None,
+                ))
+
+        return tokens
 
     ########################################################################################################################
 
     @staticmethod
     def transform_ws(*, text, ws, ner):
-        """Transform word-segmented sentence lists (create a new instance)."""
+        """Transform word-segmented sentence lists (create a new instance).
+
+        The words are split at the boundaries of the named-entities, and the characters inside a named-entity are merged
+        into one word (a latter named-entity overrides the former ones if they overlap).
+
+        The boundaries of all the lines are stored in one flat array (with one extra slot per line for the line end),
+        and the named-entity spans are applied in one vectorized pass. An :class:`IndexError` is raised if a span is
+        out of its line.
+        """
         assert isinstance(text, _TextParagraph)
         assert isinstance(ws, _SegParagraph)
         assert isinstance(ner, _NerParagraph)
 
-        ws_new = []
-        for line, line_ws, line_ner in zip(text, ws, ner):
-            line_bi = _np.zeros(len(line)+1, dtype=_np.bool)
-            line_bi[0] = True
-            line_bi[_np.cumsum(list(map(len, line_ws)))] = True
-            for _, _, (idx0, idx1,) in line_ner:
-                line_bi[[idx0, idx1]] = True
-                line_bi[idx0+1:idx1] = False
-            idxs = _np.where(line_bi)[0]
-            ws_new.append([line[idx0:idx1] for idx0, idx1 in zip(idxs[:-1], idxs[1:])])
-        return _SegParagraph.from_list(ws_new)
+        num_lines = min(len(text), len(ws), len(ner))
+        if not num_lines:
+            return _SegParagraph()
+        text = text[:num_lines]
+
+        # Word boundaries
+        line_lens = _np.fromiter(map(len, text), dtype=_np.int64, count=num_lines)
+        line_starts = _np.concatenate([[0], _np.cumsum(line_lens+1)[:-1]])
+        bi = _np.zeros(line_starts[-1]+line_lens[-1]+1, dtype=bool)
+        bi[line_starts] = True
+        bi[_flat_word_ends(ws[:num_lines], line_starts)[0]] = True
+
+        # Named-entity boundaries (set both ends and clear the inside)
+        spans = [
+            (line_id, idx0, idx1,)
+            for line_id, line_ner in enumerate(ner[:num_lines])
+            for _, _, (idx0, idx1,) in line_ner
+        ]
+        if spans:
+            spans = _np.array(spans, dtype=_np.int64)
+            span_line_lens = line_lens[spans[:, 0]]
+            invalid = ((spans[:, 1:] < 0) | (spans[:, 1:] > span_line_lens[:, None])).any(axis=1)
+            if invalid.any():  # a span out of its line would be written into the neighbour lines
+                line_id, idx0, idx1 = spans[_np.argmax(invalid)].tolist()
+                raise IndexError(f'named-entity span ({idx0}, {idx1}) is out of line {line_id} of length {line_lens[line_id]}')
+            idx0s = line_starts[spans[:, 0]] + spans[:, 1]
+            idx1s = line_starts[spans[:, 0]] + spans[:, 2]
+            ner_ids = _np.arange(len(spans))
+
+            inner_lens = _np.maximum(idx1s - idx0s - 1, 0)
+            inner_ner_ids = _np.repeat(ner_ids, inner_lens)
+            inner_starts = _np.cumsum(inner_lens) - inner_lens  # the offsets of the inner positions of each entity
+            inner_idxs = _np.arange(inner_lens.sum()) + _np.repeat(idx0s + 1 - inner_starts, inner_lens)
+
+            idxs = _np.concatenate([idx0s, idx1s, inner_idxs])
+            writers = _np.concatenate([ner_ids, ner_ids, inner_ner_ids])
+            values = _np.arange(len(idxs)) < 2 * len(spans)
+
+            # The last named-entity covering a position wins
+            last_writers = _np.full(len(bi), -1, dtype=_np.int64)
+            _np.maximum.at(last_writers, idxs, writers)
+            final = writers == last_writers[idxs]
+            bi[idxs[final]] = values[final]
+
+        # Slice words between adjacent boundaries of the same line
+        idxs = _np.flatnonzero(bi)
+        line_ids = _np.searchsorted(line_starts, idxs, side='right') - 1
+        same_line = line_ids[1:] == line_ids[:-1]
+        word_idx0s = (idxs[:-1] - line_ids[:-1])[same_line]  # the offsets in the joined text
+        word_idx1s = (idxs[1:] - line_ids[1:])[same_line]
+
+        joined_text = ''.join(text)
+        words = [joined_text[idx0:idx1] for idx0, idx1 in zip(word_idx0s.tolist(), word_idx1s.tolist())]
+        word_offsets = _np.concatenate([
+            [0], _np.cumsum(_np.bincount(line_ids[:-1][same_line], minlength=num_lines)),
+        ]).tolist()
+        return _SegParagraph.from_list([words[idx0:idx1] for idx0, idx1 in zip(word_offsets[:-1], word_offsets[1:])])
 
     @staticmethod
     def transform_pos(*, ws, pos, ner):
-        """Transform pos-tag sentence lists (modify in-place)."""
+        """Transform pos-tag sentence lists (modify in-place).
+
+        The POS-tag of the word ends at a ``PERSON`` named-entity is set to ``Nb``. A :class:`KeyError` is raised if
+        the named-entity does not end at a word end of its line.
+        """
         assert isinstance(ws, _SegParagraph)
         assert isinstance(pos, _SegParagraph)
         assert isinstance(ner, _NerParagraph)
 
-        for line_ws, line_pos, line_ner in zip(ws, pos, ner):
-            idxmap = {idx: i for i, idx in enumerate(_np.cumsum(list(map(len, line_ws))))}
+        num_lines = min(len(ws), len(pos), len(ner))
+        if not num_lines:
+            return
+        ws = ws[:num_lines]
+
+        word_counts = _np.fromiter(map(len, ws), dtype=_np.int64, count=num_lines)
+        line_lens = _np.fromiter((sum(map(len, line_ws)) for line_ws in ws), dtype=_np.int64, count=num_lines)
+        line_starts = _np.concatenate([[0], _np.cumsum(line_lens+1)[:-1]])
+        word_ends, word_offsets = _flat_word_ends(ws, line_starts, word_counts=word_counts)
+
+        for line_id, line_ner in enumerate(ner[:num_lines]):
             for token in line_ner:
                 if token.ner == 'PERSON':
-                    line_pos[idxmap[token.idx[1]]] = 'Nb'
+                    idx1 = token.idx[1]
+                    if not 0 < idx1 <= line_lens[line_id]:  # out of the line
+                        raise KeyError(idx1)
+                    word_id = _np.searchsorted(word_ends, line_starts[line_id] + idx1, side='right') - 1
+                    if word_id < word_offsets[line_id] or word_ends[word_id] != line_starts[line_id] + idx1:
+                        raise KeyError(idx1)
+                    pos[line_id][word_id - word_offsets[line_id]] = 'Nb'
+
+    @staticmethod
+    def mark_clauses(*, ws, pos):
+        """Segment the sentences into clauses and mark the clauses worth parsing for coreference.
+
+        A clause is marked if either:
+
+        1. it contains a human word or a pronoun (see :data:`HUMAN_FLAG` and :data:`PRONOUN_FLAG`), which produces
+           sources, targets and subjects;
+        2. it starts with a verb, after adverbs (``D*``) and conjunctions (``Cb*``) only, i.e. it may contain a zero
+           anaphora.
+
+        The unmarked clauses start with a (non-human) noun, or contain no verb; they are usually parsed as ``S`` or
+        ``NP`` without subjects, and only end the context of the last subject. Pass their IDs as **unparsed** of
+        :class:`CkipCorefChunker` to reproduce this effect without parsing them.
+
+        Parameters
+        ----------
+            ws : :class:`~ckipnlp.container.seg.SegParagraph`
+                The word-segmented sentences.
+            pos : :class:`~ckipnlp.container.seg.SegParagraph`
+                The part-of-speech sentences.
+
+        Returns
+        -------
+            List[List[Tuple[:class:`~ckipnlp.container.util.clause.ClauseSpan`, bool]]]
+                the clauses of each sentence and whether they should be parsed.
+        """
+        marks_list = []
+        for ws_sent, pos_sent, clauses in zip(ws, pos, _segment_clauses(ws=ws, pos=pos)):
+            marks = []
+            for clause in clauses:
+                marked = bool(clause.idxs) and (
+                    any(_classify_word(ws_sent[idx], pos_sent[idx]) & (HUMAN_FLAG | PRONOUN_FLAG) for idx in clause.idxs)
+                    or _has_zero_subject(pos_sent[idx] for idx in clause.idxs)
+                )
+                marks.append((clause, marked,))
+            marks_list.append(marks)
+        return marks_list
 
     ########################################################################################################################
 
+    @staticmethod
+    def _classify_leaves(tree):
+        """Classify the leaves of a tree
+
+        Parameters
+        ----------
+            tree : :class:`~ckipnlp.container.util.parse_tree.CompactParseTree`
+                the constituency parsing tree (the cached :attr:`~ckipnlp.container.parse.ParseClause.tree`).
+
+        Returns
+        -------
+            Dict[int, Tuple[:class:`~ckipnlp.container.util.parse_tree.CompactParseNode`, int]]
+                the identifier of leaves => the leaf nodes and their word class flags (in the order of ``tree.leaves()``).
+        """
+        return {
+            node.identifier: (node, _classify_word(node.data.word, node.data.pos),)
+            for node in tree.analysis.leaves
+        }
+
     @classmethod
-    def _get_sources(cls, tree):
+    def _get_sources(cls, tree, *, leaf_flags=None):
         """Get sources of a tree
 
         Parameters
         ----------
-            tree : :class:`~ckipnlp.container.util.parse_tree.ParseTree`
-                the constituency parsing tree.
+            tree : :class:`~ckipnlp.container.util.parse_tree.CompactParseTree`
+                the constituency parsing tree (the cached :attr:`~ckipnlp.container.parse.ParseClause.tree`).
+            leaf_flags : Dict[int, Tuple[:class:`~ckipnlp.container.util.parse_tree.CompactParseNode`, int]]
+                (*optional*) the classified leaves (see :meth:`_classify_leaves`).
 
         Yields
         ------
@@ -311,18 +674,23 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
             2. is one of the human words from E-HowNet
 
         """
-        for node in tree.leaves():
-            if cls._is_human_word(node):
-                yield node.identifier, False
+        if leaf_flags is None:
+            leaf_flags = cls._classify_leaves(tree)
+
+        for node_id, (_, flags) in leaf_flags.items():
+            if flags & HUMAN_FLAG:
+                yield node_id, False
 
     @classmethod
-    def _get_targets(cls, tree):
+    def _get_targets(cls, tree, *, leaf_flags=None):
         """Get targets of a tree
 
         Parameters
         ----------
-            tree : :class:`~ckipnlp.container.util.parse_tree.ParseTree`
-                the constituency parsing tree.
+            tree : :class:`~ckipnlp.container.util.parse_tree.CompactParseTree`
+                the constituency parsing tree (the cached :attr:`~ckipnlp.container.parse.ParseClause.tree`).
+            leaf_flags : Dict[int, Tuple[:class:`~ckipnlp.container.util.parse_tree.CompactParseNode`, int]]
+                (*optional*) the classified leaves (see :meth:`_classify_leaves`).
 
         Yields
         ------
@@ -339,8 +707,11 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
             2. is one of the pronoun words from E-HowNet
 
         """
+        if leaf_flags is None:
+            leaf_flags = cls._classify_leaves(tree)
+
         root = tree[tree.root]
-        leaves = tree.leaves()
+        leaves = [node for node, _ in leaf_flags.values()]
 
         if root.data.pos == 'VP':
             if leaves[0].data.pos.startswith('Cb'): # coref will be inserted after this Cb node
@@ -348,9 +719,9 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
             else: # coref will be inserted in front of the whole sentence
                 yield leaves[0].identifier, True
 
-        for node in leaves:
-            if cls._is_pronoun_word(node):
-                yield node.identifier, False
+        for node_id, (_, flags) in leaf_flags.items():
+            if flags & PRONOUN_FLAG:
+                yield node_id, False
 
     ########################################################################################################################
 
@@ -360,8 +731,8 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
 
         Parameters
         ----------
-            tree : :class:`~ckipnlp.container.util.parse_tree.ParseTree`
-                the constituency parsing tree.
+            tree : :class:`~ckipnlp.container.util.parse_tree.CompactParseTree`
+                the constituency parsing tree (the cached :attr:`~ckipnlp.container.parse.ParseClause.tree`).
 
         Yields
         ------
@@ -370,15 +741,15 @@ class CkipCorefChunker(_BaseDriver):  # pylint: disable=too-few-public-methods
             bool
                 prepend this node or not.
         """
-        for node in tree.get_subjects():
+        for node in tree.analysis.subjects:
             yield node.identifier, False
 
     ########################################################################################################################
 
     @staticmethod
     def _is_human_word(node):
-        return node.data.pos.startswith('Nb') or node.data.pos.startswith('N') and node.data.word in _HUMAN_WORDS
+        return bool(_classify_word(node.data.word, node.data.pos) & HUMAN_FLAG)
 
     @staticmethod
     def _is_pronoun_word(node):
-        return node.data.pos.startswith('Nh') or node.data.pos.startswith('N') and node.data.word in _PRONOUN_3RD_WORDS
+        return bool(_classify_word(node.data.word, node.data.pos) & PRONOUN_FLAG)
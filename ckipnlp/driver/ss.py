@@ -9,8 +9,23 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import multiprocessing as _mp
 import re as _re
 
+import numpy as _np
+
+from bisect import (
+    bisect_right as _bisect_right,
+)
+
+from functools import (
+    partial as _partial,
+)
+
+from itertools import (
+    islice as _islice,
+)
+
 from ckipnlp.container import (
     TextParagraph as _TextParagraph,
 )
@@ -21,6 +36,319 @@ from .base import (
 
 ################################################################################################################################
 
+_SPACE_CODES = [code for code in range(0x3001) if chr(code).isspace()]  # all whitespaces are below U+3001
+
+class SentenceOffsets:
+    """The character offsets of segmented sentences in the raw text.
+
+    Attributes
+    ----------
+        spans : numpy.ndarray
+            An integer array of shape (N, 2), the (start, end) offsets of each sentence in the raw text.
+        idxmaps : List[numpy.ndarray]
+            The raw offsets of each character of each sentence,
+            or `None` if no whitespace is removed from the sentence (i.e. the offset of the i-th character is start+i).
+
+    .. code-block:: python
+
+        text, offsets = CkipSentenceSegmenter(with_offsets=True)(raw=raw)
+        start, end = offsets.span_to_raw(sent_id, idx0, idx1)
+        assert raw[start:end].replace(' ', '') == text[sent_id][idx0:idx1]
+    """
+
+    def __init__(self, spans, idxmaps):
+        self.spans = _np.asarray(spans, dtype=_np.int64).reshape(-1, 2)
+        self.idxmaps = list(idxmaps)
+        assert len(self.spans) == len(self.idxmaps)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def to_raw(self, sent_id, idx):
+        """Get the raw offset of a character of a sentence.
+
+        Parameters
+        ----------
+            sent_id : int
+                The sentence index.
+            idx : int
+                The character index in the sentence.
+
+        Returns
+        -------
+            int
+        """
+        idxmap = self.idxmaps[sent_id]
+        if idxmap is None:
+            start, end = self.spans[sent_id].tolist()
+            if not 0 <= idx < end - start:
+                raise IndexError(f'character index {idx} out of range')
+            return start + idx
+        return int(idxmap[idx])
+
+    def span_to_raw(self, sent_id, start, end):
+        """Get the raw offsets of a span of a sentence.
+
+        Parameters
+        ----------
+            sent_id : int
+                The sentence index.
+            start : int
+                The start character index in the sentence.
+            end : int
+                The end character index in the sentence.
+
+        Returns
+        -------
+            Tuple[int, int]
+        """
+        if start >= end:
+            raw_start = self.to_raw(sent_id, start) if start < self._len(sent_id) else int(self.spans[sent_id, 1])
+            return raw_start, raw_start
+        return self.to_raw(sent_id, start), self.to_raw(sent_id, end-1) + 1
+
+    def _len(self, sent_id):
+        idxmap = self.idxmaps[sent_id]
+        return int(self.spans[sent_id, 1] - self.spans[sent_id, 0]) if idxmap is None else len(idxmap)
+
+################################################################################################################################
+
+class _SentenceSegmenterEngine:
+    """The sentence segmentation engine with precompiled patterns.
+
+    Arguments
+    ---------
+        delims : str or Sequence[str]
+            The delimiters. A string is treated as a set of single-character delimiters.
+        keep_delims : bool
+            Keep the delimiters.
+    """
+
+    def __init__(self, delims, keep_delims):
+        self.delims = delims
+        self.keep_delims = keep_delims
+
+        delim_list = list(delims) if isinstance(delims, str) else list(delims)
+        assert delim_list and all(delim_list), 'Empty delimiter!'
+
+        delim_chars = ''.join(sorted(set(''.join(delim_list))))
+        if all(len(delim) == 1 for delim in delim_list):
+            delim_class = _re.escape(delim_chars)
+            delim_pattern = f'[{delim_class}]'
+            body_pattern = f'[^{delim_class}]'
+            body_sep_pattern = None
+        else:
+            delim_pattern = '(?:{})'.format('|'.join(map(_re.escape, sorted(set(delim_list), key=len, reverse=True))))
+            body_pattern = f'(?:(?!{delim_pattern}).)'
+            body_sep_pattern = f'(?:{delim_pattern}+|\\Z)'
+
+        # The sentence bodies are never empty unless the delimiters are multi-character
+        self._body_nonempty = body_sep_pattern is None
+
+        # Whitespaces except delimiter characters
+        self._space_re = _re.compile(rf'[^\S{_re.escape(delim_chars)}]')
+
+        # The sentence bodies (the bodies of multi-character delimiters must be matched with the delimiters)
+        self._body_re = _re.compile(f'{body_pattern}+', _re.S) if body_sep_pattern is None \
+                   else _re.compile(f'({body_pattern}*){body_sep_pattern}', _re.S)
+
+        # The sentences with trailing delimiters
+        self._sent_re = _re.compile(f'{body_pattern}*(?:{delim_pattern}+|\\Z)', _re.S)
+
+        # The pairs of sentence bodies and trailing delimiters
+        self._pair_re = _re.compile(f'({body_pattern}*)({delim_pattern}+|\\Z)', _re.S)
+
+        # A match ends too close to the end of text may be changed by the following text
+        self._max_delim_len = max(map(len, delim_list))
+
+        # The codes of the removed whitespaces
+        self._space_codes = _np.array([code for code in _SPACE_CODES if chr(code) not in delim_chars], dtype=_np.uint32)
+
+        # Parallel segmentation cuts the raw text unless the whitespace removal may join multi-character delimiters
+        self._cut_raw = keep_delims or body_sep_pattern is None
+
+        # A character never belongs to a delimiter (nor removed); the sentence body containing it is shared by any scan
+        self._sync_re = _re.compile(f'[^{_re.escape(delim_chars)}]' if keep_delims
+                                    else rf'[^\s{_re.escape(delim_chars)}]')
+
+    def segment(self, raw):
+        """Segment a text into sentences.
+
+        Parameters
+        ----------
+            raw : str
+                The raw text.
+
+        Returns
+        -------
+            List[str]
+                The sentences.
+        """
+        if not self.keep_delims:
+            sents = self._body_re.findall(self.remove_spaces(raw))
+            return sents if self._body_nonempty else list(filter(None, sents))
+
+        return list(filter(None, self._sent_re.findall(raw)))
+
+    def segment_with_offsets(self, raw):
+        """Segment a text into sentences, and keep the offsets of the sentences.
+
+        Parameters
+        ----------
+            raw : str
+                The raw text.
+
+        Returns
+        -------
+            List[str]
+                The sentences.
+            :class:`SentenceOffsets`
+                The offsets of the sentences in **raw**.
+        """
+        sents = []
+        spans = []
+
+        if self.keep_delims:
+            for match in self._sent_re.finditer(raw):
+                if match.end() > match.start():
+                    sents.append(match.group())
+                    spans.append(match.span())
+            return sents, self.project(spans, None)
+
+        text, idxmap = self.strip(raw)
+        for match in self._pair_re.finditer(text):
+            if match.end(1) > match.start(1):
+                sents.append(match.group(1))
+                spans.append(match.span(1))
+        return sents, self.project(spans, idxmap)
+
+    def remove_spaces(self, raw):
+        """Remove the whitespaces (except the delimiters).
+
+        Each whitespace character found is removed by :meth:`str.replace`, which is much faster than :func:`re.sub`
+        since a text usually contains only a few kinds of whitespaces.
+        """
+        match = self._space_re.search(raw)
+        while match:
+            idx = match.start()
+            raw = raw.replace(match.group(), '')
+            match = self._space_re.search(raw, idx)
+        return raw
+
+    def strip(self, raw):
+        """Remove the whitespaces, and map the characters of the whitespace-removed text to the raw text."""
+        text = self.remove_spaces(raw)
+        if len(text) == len(raw):
+            return text, None
+
+        codes = _np.frombuffer(raw.encode('utf-32-le'), dtype=_np.uint32)
+        idxmap = _np.flatnonzero(~_np.isin(codes, self._space_codes))
+        assert len(idxmap) == len(text)
+        return text, idxmap
+
+    @staticmethod
+    def project(spans, idxmap):
+        """Project the sentence spans of the whitespace-removed text to the raw text."""
+        if idxmap is None:
+            return SentenceOffsets(spans, [None] * len(spans))
+
+        raw_spans = []
+        idxmaps = []
+        for idx0, idx1 in spans:
+            raw_idx0 = int(idxmap[idx0])
+            raw_idx1 = int(idxmap[idx1-1]) + 1
+            raw_spans.append((raw_idx0, raw_idx1,))
+            idxmaps.append(None if raw_idx1 - raw_idx0 == idx1 - idx0 else idxmap[idx0:idx1])
+        return SentenceOffsets(raw_spans, idxmaps)
+
+    def cut(self, raw, chunk_size):
+        """Cut a text into chunks at sentence boundaries for parallel segmentation.
+
+        The concatenated results of segmenting the chunks are the same as the result of segmenting the whole text.
+
+        Parameters
+        ----------
+            raw : str
+                The raw text.
+            chunk_size : int
+                The minimum number of characters of each chunk (except the last one).
+
+        Returns
+        -------
+            str
+                The text being cut (**raw** itself, or **raw** without whitespaces).
+            numpy.ndarray
+                The raw offsets of the characters of the text being cut (`None` if it is **raw** itself).
+            List[int]
+                The cut positions, starts with 0 and ends with the length of the text.
+        """
+        text, idxmap = (raw, None) if self._cut_raw else self.strip(raw)
+
+        # A sentence boundary is found by scanning from a character inside a sentence body,
+        # where the scan is synchronized with the scan from the beginning of the text.
+        cuts = [0]
+        while cuts[-1] + chunk_size < len(text):
+            match = self._sync_re.search(text, cuts[-1] + chunk_size)
+            if not match:
+                break
+            match = self._pair_re.match(text, match.end())
+            if not match.group(2):  # no delimiter until the end of text
+                break
+            cuts.append(match.end())
+        cuts.append(len(text))
+
+        return text, idxmap, cuts
+
+    def iter_segment(self, chunks):
+        """Segment a stream of text chunks into sentences.
+
+        The partial sentence at the end of each chunk is carried to the next chunk.
+        The results are the same as :meth:`segment` of the concatenated text.
+
+        Parameters
+        ----------
+            chunks : Iterable[str]
+                The text chunks.
+
+        Yields
+        ------
+            str
+                The sentences.
+        """
+        buffer = ''
+        for chunk in chunks:
+            if not self.keep_delims:
+                chunk = self.remove_spaces(chunk)
+            buffer += chunk
+
+            cut = 0
+            limit = len(buffer) - self._max_delim_len
+            for match in self._pair_re.finditer(buffer):
+                if match.end() > limit:
+                    break
+                sent = match.group() if self.keep_delims else match.group(1)
+                if sent:
+                    yield sent
+                cut = match.end()
+            buffer = buffer[cut:]
+
+        yield from self.segment(buffer)
+
+################################################################################################################################
+
+_pool_engine = None  # the segmentation engine of the pool worker process
+
+def _init_ss_worker(delims, keep_delims):
+    global _pool_engine  # pylint: disable=global-statement
+    _pool_engine = _SentenceSegmenterEngine(delims, keep_delims)
+
+def _apply_ss_worker(args):
+    chunk, with_offsets = args
+    if not with_offsets:
+        return _pool_engine.segment(chunk)
+    sents, offsets = _pool_engine.segment_with_offsets(chunk)
+    return sents, offsets.spans, offsets.idxmaps
+
 class CkipSentenceSegmenter(_BaseDriver):  # pylint: disable=too-few-public-methods
     """The CKIP sentence segmentation driver.
 
@@ -28,10 +356,35 @@ class CkipSentenceSegmenter(_BaseDriver):  # pylint: disable=too-few-public-meth
     ---------
         lazy : bool
             Lazy initialize the driver.
-        delims : str
-            The delimiters.
+        delims : str or Sequence[str]
+            The delimiters. A string is treated as a set of single-character delimiters,
+            and a sequence of strings is treated as a list of (possibly multi-character) delimiters.
         keep_delims : bool
             Keep the delimiters.
+        with_offsets : bool
+            Returns the offsets of the sentences or not.
+            (Stored as **text_offsets** of the document when used in :class:`~ckipnlp.pipeline.kernel.CkipPipeline`.)
+        workers : int
+            The number of worker processes for parallel segmentation. (Segment in the current process if not set.)
+        chunk_size : int
+            The minimum number of characters sent to a worker process at once.
+            (Texts not longer than this are segmented in the current process.)
+        max_length : int
+            The maximum length of the sentences. (Unlimited if not set.)
+        sub_delims : str
+            The secondary delimiters (single characters) for splitting the sentences longer than **max_length**.
+
+    Notes
+    -----
+        The whitespaces are removed if **keep_delims** is not set, except the characters used by **delims**.
+
+        In parallel mode, the text is cut at sentence boundaries into chunks, and the results of the chunks are joined in
+        order. The results are the same as the serial mode.
+
+        A sentence longer than **max_length** is split after the last secondary delimiters within the length limit, or
+        cut at the length limit if there is none. When used in :class:`~ckipnlp.pipeline.kernel.CkipPipeline`, the
+        pieces are tagged with their original sentences; use :meth:`CkipPipeline.stitch()
+        <ckipnlp.pipeline.kernel.CkipPipeline.stitch>` to merge the results of the pieces back.
 
     .. method:: __call__(*, raw, keep_all=True)
 
@@ -41,41 +394,160 @@ class CkipSentenceSegmenter(_BaseDriver):  # pylint: disable=too-few-public-meth
             **raw** (*str*) — The raw text.
 
         Returns
-            **text** (:class:`TextParagraph <ckipnlp.container.text.TextParagraph>`) — The sentences.
+            - **text** (:class:`TextParagraph <ckipnlp.container.text.TextParagraph>`) — The sentences.
+            - **offsets** (:class:`SentenceOffsets`) — The offsets of the sentences in **raw**.
+              (returns if **with_offsets** is set.)
+
+    .. seealso::
+        :meth:`iter_text` for streaming inputs.
     """
 
     driver_type = 'sentence_segmenter'
     driver_family = 'default'
     driver_inputs = ('raw',)
 
-    def __init__(self, *, lazy=False, delims='\n', keep_delims=False):
-        super().__init__(lazy=lazy)
-
+    def __init__(self, *, lazy=False, delims='\n', keep_delims=False, with_offsets=False, workers=None, chunk_size=1<<22,
+            max_length=None, sub_delims='，、；'):
         self.delims = delims
         self._keep_delims = keep_delims
+        self._with_offsets = with_offsets
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._max_length = max_length
+        self._sub_delims = sub_delims
+        self._engine = None
+        self._pool = None
+        self._sub_delim_re = None
+
+        super().__init__(lazy=lazy)
+
+    def __del__(self):
+        if getattr(self, '_pool', None) is not None:
+            self._pool.terminate()
 
     def _init(self):
-        pass
+        self._engine = _SentenceSegmenterEngine(self.delims, self._keep_delims)
+        if self._workers:
+            self._pool = _mp.Pool(self._workers, initializer=_init_ss_worker, initargs=(self.delims, self._keep_delims,))
+        if self._sub_delims:
+            self._sub_delim_re = _re.compile(f'[{_re.escape(self._sub_delims)}]+')
 
     def _call(self, *, raw):
+        sents, offsets, _ = self._split_long(*self._segment(raw))
+        return (_TextParagraph(sents), offsets,) if self._with_offsets else _TextParagraph(sents)
+
+    def _call_from_pipeline(self, pipeline, doc):
+        self.init()
+        sents, sent_offsets = self._segment(pipeline._get('raw', doc))  # pylint: disable=protected-access
+        sents, offsets, groups = self._split_long(sents, sent_offsets)
+        doc._text_groups = groups  # pylint: disable=protected-access
+        doc._text_group_offsets = sent_offsets if groups is not None else None  # pylint: disable=protected-access
+        doc.text_offsets = offsets
+        return _TextParagraph(sents)
+
+    def _segment(self, raw):
         assert isinstance(raw, str)
 
-        if not self._keep_delims:
-            # Replace spaces
-            text = _re.sub(rf'[^\S{self.delims}]', '', raw)
+        if self._pool is not None and len(raw) > self._chunk_size:
+            sents, offsets = self._segment_parallel(raw)
+        elif self._with_offsets:
+            sents, offsets = self._engine.segment_with_offsets(raw)
+        else:
+            sents, offsets = self._engine.segment(raw), None
 
-            # Segment
-            text = _re.split(rf'[{self.delims}]+', text)
+        return sents, offsets
 
-            # Remove empty lines
-            text = filter(None, text)
+    def _segment_parallel(self, raw):
+        text, idxmap, cuts = self._engine.cut(raw, self._chunk_size)
+        results = self._pool.imap(_apply_ss_worker, (
+            (text[idx0:idx1], self._with_offsets,) for idx0, idx1 in zip(cuts[:-1], cuts[1:])
+        ))
 
-        else:
-            text = _re.split(rf'([{self.delims}]+)', raw)
-            if text[-1] == '':
-                del text[-1]
-            if len(text) % 2:
-                text.append('')
-            text = [word+punct for word, punct in zip(text[::2], text[1::2])]
-
-        return _TextParagraph.from_text(text)
+        if not self._with_offsets:
+            return [sent for chunk_sents in results for sent in chunk_sents], None
+
+        sents = []
+        spans = []
+        idxmaps = []
+        for idx0, (chunk_sents, chunk_spans, chunk_idxmaps) in zip(cuts, results):
+            sents += chunk_sents
+            spans.append(chunk_spans + idx0)
+            idxmaps += (chunk_idxmap if chunk_idxmap is None else chunk_idxmap + idx0 for chunk_idxmap in chunk_idxmaps)
+
+        offsets = SentenceOffsets(_np.concatenate(spans), idxmaps)
+        if idxmap is not None:  # the chunks are cut from the whitespace-removed text
+            offsets = self._engine.project(offsets.spans.tolist(), idxmap)
+        return sents, offsets
+
+    def _split_long(self, sents, offsets):
+        if not self._max_length or all(len(sent) <= self._max_length for sent in sents):
+            return sents, offsets, None
+
+        pieces = []
+        groups = []
+        spans = []
+        idxmaps = []
+
+        for sent_id, sent in enumerate(sents):
+            bounds = self._cut_long(sent) if len(sent) > self._max_length else ((0, len(sent),),)
+            for idx0, idx1 in bounds:
+                pieces.append(sent[idx0:idx1])
+                groups.append(sent_id)
+                if offsets is not None:
+                    raw_idx0, raw_idx1 = offsets.span_to_raw(sent_id, idx0, idx1)
+                    idxmap = offsets.idxmaps[sent_id]
+                    spans.append((raw_idx0, raw_idx1,))
+                    idxmaps.append(None if raw_idx1 - raw_idx0 == idx1 - idx0 else idxmap[idx0:idx1])
+
+        return pieces, SentenceOffsets(spans, idxmaps) if offsets is not None else None, groups
+
+    def _cut_long(self, sent):
+        """Cut a long sentence after the secondary delimiters, or at every **max_length** characters if there is none."""
+        sub_bounds = [match.end() for match in self._sub_delim_re.finditer(sent)] if self._sub_delim_re else []
+
+        bounds = []
+        idx0 = 0
+        while len(sent) - idx0 > self._max_length:
+            pos = _bisect_right(sub_bounds, idx0 + self._max_length) - 1
+            idx1 = sub_bounds[pos] if pos >= 0 and sub_bounds[pos] > idx0 else idx0 + self._max_length
+            bounds.append((idx0, idx1,))
+            idx0 = idx1
+        bounds.append((idx0, len(sent),))
+
+        return bounds
+
+    def iter_text(self, raw, *, batch_size=None, chunk_size=1<<20):
+        """Apply sentence segmentation lazily on a stream.
+
+        The memory usage is bounded by the longest sentence (plus **chunk_size**) instead of the size of the input.
+        The sentences are not split by **max_length**.
+
+        Parameters
+        ----------
+            raw : TextIO or Iterable[str]
+                A text file object, or an iterable of text chunks.
+            batch_size : int
+                Yield batches of sentences instead of single sentences.
+            chunk_size : int
+                The number of characters read from the file object at once.
+
+        Yields
+        ------
+            str or :class:`TextParagraph <ckipnlp.container.text.TextParagraph>`
+                The sentences (or the batches of sentences if **batch_size** is set).
+        """
+        self.init()
+
+        if hasattr(raw, 'read'):
+            raw = iter(_partial(raw.read, chunk_size), '')
+        sents = self._engine.iter_segment(raw)
+
+        if not batch_size:
+            yield from sents
+            return
+
+        while True:
+            text = _TextParagraph(_islice(sents, batch_size))
+            if not text:
+                return
+            yield text
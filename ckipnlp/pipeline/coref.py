@@ -13,6 +13,16 @@ from collections.abc import (
     Mapping as _Mapping,
 )
 
+from itertools import (
+    accumulate as _accumulate,
+    chain as _chain,
+)
+
+from ckipnlp.container import (
+    SegParagraph as _SegParagraph,
+    ParseParagraph as _ParseParagraph,
+)
+
 from ckipnlp.driver.base import (
     DriverRegister as _DriverRegister,
 )
@@ -46,6 +56,8 @@ class CkipCorefDocument(_Mapping):
         self.conparse = conparse
         self.coref = coref
 
+        self._unparsed = None  # the IDs of the clauses left unparsed by the pre-filter in each sentence
+
     def __len__(self):
         return len(self.__keys)
 
@@ -80,6 +92,11 @@ class CkipCorefPipeline(_CkipPipeline):
         coref_chunker : str
             The type of coreference resolution chunker.
 
+        prefilter : bool
+            Parse only the clauses marked by :meth:`~ckipnlp.driver.coref.CkipCorefChunker.mark_clauses`.
+            The other clauses are stored unparsed (as clauses without trees) in **conparse**;
+            the coreference resolution treats them as subjectless ``S`` or ``NP`` clauses.
+
     Other Parameters
     ----------------
         lazy : bool
@@ -91,6 +108,7 @@ class CkipCorefPipeline(_CkipPipeline):
 
     def __init__(self, *,
         coref_chunker='default',
+        prefilter=False,
         lazy=True,
         opts={},
         **kwargs,
@@ -104,6 +122,7 @@ class CkipCorefPipeline(_CkipPipeline):
         self._coref_chunker = _DriverRegister.get('coref_chunker', coref_chunker)(
             lazy=lazy, **opts.get('coref_chunker', {}),
         )
+        self._prefilter = prefilter
 
     def __call__(self, doc):
         """Apply coreference delectation.
@@ -148,22 +167,56 @@ class CkipCorefPipeline(_CkipPipeline):
 
             **doc** is also modified if necessary dependencies (**ws**, **pos**, **ner**) is not computed yet.
         """
-        self.get_text(doc)
-        self.get_ws(doc)
-        self.get_pos(doc)
-        self.get_ner(doc)
+        self._get_coref_many([doc], [corefdoc])
+        return corefdoc.coref
+
+    def process_many(self, docs):
+        """Apply coreference delectation on many documents.
+
+        The documents share one driver call for each of word segmentation, part-of-speech tagging, named-entity
+        recognition, and constituency parsing; the coreference resolution is applied on each document separately.
+
+        Arguments
+        ---------
+            docs : Iterable[:class:`~.kernel.CkipDocument`]
+                The input documents.
+
+        Returns
+        -------
+            corefdocs : List[:class:`CkipCorefDocument`]
+                The coreference documents.
+
+        .. note::
+
+            **docs** are also modified if necessary dependencies (**ws**, **pos**, **ner**) is not computed yet.
+        """
+        docs = list(docs)
+        corefdocs = [CkipCorefDocument() for _ in docs]
+        self._get_coref_many(docs, corefdocs)
+        return corefdocs
+
+    ########################################################################################################################
+
+    def _get_coref_many(self, docs, corefdocs):
+        for doc in docs:
+            self.get_text(doc)
+        self._get_many('ws', docs, inputs=self._word_segmenter.driver_inputs)
+        self._get_many('pos', docs, inputs=self._pos_tagger.driver_inputs)
+        self._get_many('ner', docs, inputs=self._ner_chunker.driver_inputs)
 
         # Update word segmentation
-        if corefdoc.ws is None:
-            corefdoc.ws = self._coref_chunker.transform_ws(
-                text=doc.text,
-                ws=doc.ws,
-                ner=doc.ner,
-            )
+        for doc, corefdoc in zip(docs, corefdocs):
+            if corefdoc.ws is None:
+                corefdoc.ws = self._coref_chunker.transform_ws(
+                    text=doc.text,
+                    ws=doc.ws,
+                    ner=doc.ner,
+                )
 
         # Update POS-tagging
-        if corefdoc.pos is None:
-            corefdoc.pos = self.get_pos(corefdoc)
+        pairs = [(doc, corefdoc,) for doc, corefdoc in zip(docs, corefdocs) if corefdoc.pos is None]
+        self._get_pos_changed(pairs)
+        for doc, corefdoc in pairs:
             self._coref_chunker.transform_pos(
                 ws=corefdoc.ws,
                 pos=corefdoc.pos,
@@ -171,10 +224,111 @@ class CkipCorefPipeline(_CkipPipeline):
             )
 
         # Do parsing
-        if corefdoc.conparse is None:
-            corefdoc.conparse = self.get_conparse(corefdoc)
+        if self._prefilter:
+            self._get_conparse_marked([corefdoc for corefdoc in corefdocs if corefdoc.conparse is None])
+        else:
+            self._get_many('conparse', corefdocs, inputs=self._con_parser.driver_inputs)
+
+        # Do coreference resolution (the states are not shared between documents)
+        for corefdoc in corefdocs:
+            corefdoc.coref = self._coref_chunker(
+                conparse=corefdoc.conparse,
+                unparsed=corefdoc._unparsed,  # pylint: disable=protected-access
+            )
 
-        # Do coreference resolution
-        corefdoc.coref = self._coref_chunker(conparse=corefdoc.conparse)
+    def _get_many(self, key, docs, *, inputs):
+        """Compute **key** of the documents with one driver call.
 
-        return corefdoc.coref
+        The **inputs** (the :attr:`driver_inputs` of the driver of **key**) of the documents without **key** are
+        concatenated into one document, and the result is split back into the documents. The documents are computed
+        one by one if the driver takes no inputs (i.e. a dummy driver).
+        """
+        docs = [doc for doc in docs if doc[key] is None]
+        if len(docs) <= 1 or not inputs:
+            for doc in docs:
+                self._get(key, doc)
+            return
+
+        merged = type(docs[0])(**{
+            name: type(docs[0][name])(_chain.from_iterable(doc[name] for doc in docs)) for name in inputs
+        })
+        result = self._get(key, merged)
+
+        offsets = list(_accumulate(_chain((0,), (len(doc[inputs[0]]) for doc in docs))))
+        for doc, idx0, idx1 in zip(docs, offsets[:-1], offsets[1:]):
+            setattr(doc, key, result[idx0:idx1])
+
+    def _get_pos_changed(self, pairs):
+        """Apply part-of-speech tagging on the sentences with word segmentation changed by the named-entities only.
+
+        The POS-tags of the other sentences are copied from **doc**. The changed sentences of all the
+        (**doc**, **corefdoc**) pairs are tagged with one driver call.
+        """
+        pos_lists = []
+        changed_ids = []
+        for pair_id, (doc, corefdoc) in enumerate(pairs):
+            pos_list = []
+            for sent_id, coref_ws_sent in enumerate(corefdoc.ws):
+                if sent_id < len(doc.ws) and list(coref_ws_sent) == list(doc.ws[sent_id]):
+                    pos_list.append(list(doc.pos[sent_id]))
+                else:
+                    pos_list.append(None)
+                    changed_ids.append((pair_id, sent_id,))
+            pos_lists.append(pos_list)
+
+        if changed_ids:
+            subdoc = CkipCorefDocument(ws=_SegParagraph.from_list([
+                pairs[pair_id][1].ws[sent_id] for pair_id, sent_id in changed_ids
+            ]))
+            for (pair_id, sent_id), pos_sent in zip(changed_ids, self.get_pos(subdoc)):
+                pos_lists[pair_id][sent_id] = list(pos_sent)
+
+        for (_, corefdoc), pos_list in zip(pairs, pos_lists):
+            corefdoc.pos = _SegParagraph.from_list(pos_list)
+
+    def _get_conparse_marked(self, corefdocs):
+        """Apply constituency parsing on the clauses marked by the coreference chunker only.
+
+        The marked clauses of all the documents are parsed with one driver call.
+        The IDs of the unparsed clauses are kept for the coreference resolution.
+        """
+        marks_lists = [self._coref_chunker.mark_clauses(ws=corefdoc.ws, pos=corefdoc.pos) for corefdoc in corefdocs]
+
+        # Parse the marked clauses (one clause per sentence)
+        spans = [
+            (corefdoc, sent_id, clause.start, clause.end,)
+            for corefdoc, marks_list in zip(corefdocs, marks_lists)
+            for sent_id, marks in enumerate(marks_list) for clause, marked in marks if marked and clause.idxs
+        ]
+        clause_parse_list = []
+        if spans:
+            subdoc = CkipCorefDocument(
+                ws=_SegParagraph.from_list([corefdoc.ws[sent_id][idx0:idx1] for corefdoc, sent_id, idx0, idx1 in spans]),
+                pos=_SegParagraph.from_list([corefdoc.pos[sent_id][idx0:idx1] for corefdoc, sent_id, idx0, idx1 in spans]),
+            )
+            clause_parse_list = self.get_conparse(subdoc).to_list()
+        clause_parse_iter = iter(clause_parse_list)
+
+        # Merge results
+        for corefdoc, marks_list in zip(corefdocs, marks_lists):
+            conparse_text = []
+            unparsed = []
+            for ws_sent, marks in zip(corefdoc.ws, marks_list):
+                conparse_sent_text = []
+                unparsed_ids = []
+                for clause, marked in marks:
+                    if not clause.idxs:
+                        if not conparse_sent_text:
+                            conparse_sent_text.append([None, '',])
+                        conparse_sent_text[-1][1] += clause.delim
+                    elif marked:
+                        conparse_sent_text.extend(next(clause_parse_iter))
+                    else:
+                        unparsed_ids.append(len(conparse_sent_text))
+                        conparse_sent_text.append([None, ''.join(ws_sent[idx] for idx in clause.idxs) + clause.delim,])
+
+                conparse_text.append(conparse_sent_text)
+                unparsed.append(unparsed_ids)
+
+            corefdoc.conparse = _ParseParagraph.from_list(conparse_text)
+            corefdoc._unparsed = unparsed  # pylint: disable=protected-access
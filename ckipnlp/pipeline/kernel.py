@@ -13,6 +13,19 @@ from collections.abc import (
     Mapping as _Mapping,
 )
 
+from itertools import (
+    accumulate as _accumulate,
+    chain as _chain,
+    groupby as _groupby,
+)
+
+from ckipnlp.container import (
+    TextParagraph as _TextParagraph,
+    SegParagraph as _SegParagraph,
+    NerParagraph as _NerParagraph,
+    ParseParagraph as _ParseParagraph,
+)
+
 from ckipnlp.driver.base import (
     DriverRegister as _DriverRegister,
 )
@@ -36,6 +49,9 @@ class CkipDocument(_Mapping):
             The named-entity recognition results.
         conparse : :class:`~ckipnlp.container.parse.ParseParagraph`
             The constituency-parsing sentences.
+        text_offsets : :class:`~ckipnlp.driver.ss.SentenceOffsets`
+            The offsets of the sentences in **raw**.
+            (Set by the sentence segmenter if its **with_offsets** is set.)
     """
 
     __keys = ('raw', 'text', 'ws', 'pos', 'ner', 'conparse',)
@@ -47,8 +63,11 @@ class CkipDocument(_Mapping):
         self.pos = pos
         self.ner = ner
         self.conparse = conparse
+        self.text_offsets = None
 
         self._wspos = None
+        self._text_groups = None  # the original sentence indices of the sentences split by the sentence segmenter
+        self._text_group_offsets = None  # the offsets of the original sentences (if the offsets are requested)
 
     def __len__(self):
         return len(self.__keys)
@@ -88,6 +107,11 @@ class CkipPipeline:
 
         opts : Dict[str, Dict]
             The driver options. Key: driver name (e.g. `'sentence_segmenter'`); Value: a dictionary of options.
+
+    Notes
+    -----
+        Call :meth:`close` (or use the pipeline as a context manager) to shut down the worker processes of the
+        multi-process drivers (e.g. ``'classic-pool'``).
     """
 
     def __init__(self, *,
@@ -100,19 +124,19 @@ class CkipPipeline:
             opts={},
         ):
 
-        if word_segmenter == '_classic':
-            word_segmenter = 'classic'
-        if pos_tagger == '_classic':
-            pos_tagger = 'classic'
+        if word_segmenter in ('_classic', '_classic-pool',):
+            word_segmenter = word_segmenter[1:]
+        if pos_tagger in ('_classic', '_classic-pool',):
+            pos_tagger = pos_tagger[1:]
 
         # WS & POS
-        if pos_tagger == 'classic':
-            assert word_segmenter == 'classic', 'CkipClassicPosTagger must be used with CkipClassicWordSegmenter together!'
-            self._wspos_driver = _DriverRegister.get('_wspos', '_classic')(
+        if pos_tagger in ('classic', 'classic-pool',):
+            assert word_segmenter == pos_tagger, 'CkipClassicPosTagger must be used with CkipClassicWordSegmenter together!'
+            self._wspos_driver = _DriverRegister.get('_wspos', f'_{pos_tagger}')(
                 lazy=lazy, **opts.get('word_segmenter', {}), **opts.get('pos_tagger', {}),
             )
-            word_segmenter = '_classic'
-            pos_tagger = '_classic'
+            word_segmenter = f'_{word_segmenter}'
+            pos_tagger = f'_{pos_tagger}'
         else:
             self._wspos_driver = _DriverRegister.get(None, None)()
 
@@ -132,6 +156,18 @@ class CkipPipeline:
             lazy=lazy, **opts.get('ner_chunker', {}),
         )
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes of the drivers."""
+        for driver in vars(self).values():
+            if hasattr(driver, 'close'):
+                driver.close()
+
     ########################################################################################################################
 
     def _get(self, key, doc):
@@ -196,6 +232,88 @@ class CkipPipeline:
         """
         return self._get('text', doc)
 
+    def iter_docs(self, raw, *, batch_size=1000, **kwargs):
+        """Apply sentence segmentation lazily on a stream.
+
+        Arguments
+        ---------
+            raw : TextIO or Iterable[str]
+                A text file object, or an iterable of text chunks.
+            batch_size : int
+                The maximum number of sentences per document.
+
+        Other Parameters
+        ----------------
+            **kwargs
+                Extra options for :meth:`CkipSentenceSegmenter.iter_text() <ckipnlp.driver.ss.CkipSentenceSegmenter.iter_text>`.
+
+        Yields
+        ------
+            :class:`CkipDocument`
+                The documents with sentences (**text**) only.
+        """
+        for text in self._sentence_segmenter.iter_text(raw, batch_size=batch_size, **kwargs):
+            yield CkipDocument(text=text)
+
+    def stitch(self, doc):
+        """Merge the results of the split sentences back into their original sentences.
+
+        The sentences longer than **max_length** of :class:`~ckipnlp.driver.ss.CkipSentenceSegmenter` are split into
+        pieces before being sent to the models. This routine concatenates the **text**, **ws**, **pos**, **ner**, and
+        **conparse** of the pieces (and shifts the indices of the named-entities) of each original sentence, and restores
+        the **text_offsets** of the original sentences.
+
+        Arguments
+        ---------
+            doc : :class:`CkipDocument`
+                The input document.
+
+        Returns
+        -------
+            doc : :class:`CkipDocument`
+                The input document.
+
+        .. note::
+
+            This routine modify **doc** inplace.
+        """
+        groups = doc._text_groups  # pylint: disable=protected-access
+        if groups is None:
+            return doc
+
+        idxs_list = [[idx for idx, _ in items] for _, items in _groupby(enumerate(groups), key=lambda item: item[1])]
+
+        if doc.ner is not None:
+            doc.ner = _NerParagraph.from_list([
+                [
+                    (word, ner, (idx0+shift, idx1+shift,),)
+                    for idx, shift in zip(idxs, _accumulate(_chain((0,), (len(doc.text[idx]) for idx in idxs))))
+                    for word, ner, (idx0, idx1,) in doc.ner[idx]
+                ] for idxs in idxs_list
+            ])
+
+        if doc.text is not None:
+            doc.text = _TextParagraph(''.join(doc.text[idx] for idx in idxs) for idxs in idxs_list)
+
+        for key in ('ws', 'pos',):
+            if doc[key] is not None:
+                setattr(doc, key, _SegParagraph.from_list([
+                    list(_chain.from_iterable(doc[key][idx] for idx in idxs)) for idxs in idxs_list
+                ]))
+
+        if doc.conparse is not None:
+            doc.conparse = _ParseParagraph.from_list([
+                [clause.to_list() for idx in idxs for clause in doc.conparse[idx]] for idxs in idxs_list
+            ])
+
+        if doc.text_offsets is not None:
+            doc.text_offsets = doc._text_group_offsets  # pylint: disable=protected-access
+
+        doc._wspos = None  # pylint: disable=protected-access
+        doc._text_groups = None  # pylint: disable=protected-access
+        doc._text_group_offsets = None  # pylint: disable=protected-access
+        return doc
+
     ########################################################################################################################
 
     def get_ws(self, doc):
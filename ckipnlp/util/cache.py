@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""
+This module implements caching utilities for CKIPNLP.
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+import json as _json
+import os as _os
+
+from collections import (
+    OrderedDict as _OrderedDict,
+)
+
+from ckipnlp.util.logger import (
+    get_logger as _get_logger,
+)
+
+################################################################################################################################
+
+class ClauseCache:
+    """The least-recently-used cache of parsed clauses.
+
+    Arguments
+    ---------
+        maxsize : int
+            The maximum number of cached clauses. (Unlimited if `None`.)
+        path : str
+            (*optional*) The JSON file for persistence. The cache is loaded from this file if it exists.
+
+    Notes
+    -----
+        The keys are the word-segmented and part-of-speech clauses in text format (see :meth:`WsPosSentence.to_text
+        <ckipnlp.container.util.wspos.WsPosSentence.to_text>`), and the values are the lists of parsed clauses.
+
+        One instance may be shared by several drivers (e.g. :class:`~ckipnlp.driver.classic.CkipClassicConParser` and
+        :class:`~ckipnlp.driver.classic.CkipClassicConParserClient`).
+    """
+
+    def __init__(self, maxsize=65536, *, path=None):
+        assert maxsize is None or maxsize > 0
+        self.maxsize = maxsize
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+        self._data = _OrderedDict()
+
+        if path and _os.path.isfile(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Get the cached value of a clause (and mark it as recently used)."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Cache the value of a clause (and evict the least recently used ones if necessary)."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached clauses."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    ########################################################################################################################
+
+    def load(self, path=None):
+        """Load the cache from a JSON file.
+
+        Parameters
+        ----------
+            path : str
+                The file path. (Use **self.path** if not set.)
+        """
+        path = path or self.path
+        _get_logger().debug(f'Loading clause cache from {path} ...')
+        with open(path, encoding='utf-8') as fin:
+            for key, value in _json.load(fin):
+                self.put(key, value)
+
+    def save(self, path=None):
+        """Save the cache into a JSON file (from the least to the most recently used).
+
+        Parameters
+        ----------
+            path : str
+                The file path. (Use **self.path** if not set.)
+        """
+        path = path or self.path
+        assert path, 'No path for clause cache!'
+        _get_logger().debug(f'Saving clause cache to {path} ...')
+        with open(path, 'w', encoding='utf-8') as fout:
+            _json.dump(list(self._data.items()), fout, ensure_ascii=False)
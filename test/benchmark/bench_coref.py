@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""Benchmark of the coreference clustering on documents with thousands of mentions.
+
+Usage: PYTHONPATH=../.. python3 bench_coref.py
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+import random
+import timeit
+
+from treelib import Tree
+
+from ckipnlp.container import CorefParagraph, ParseParagraph
+from ckipnlp.data.conparse import APPOSITION_ROLES
+from ckipnlp.data.coref import SELF_WORDS
+from ckipnlp.driver.coref import CkipCorefChunker, CorefState
+
+################################################################################################################################
+
+class LegacyCorefChunker(CkipCorefChunker):
+    """The treelib-based implementation."""
+
+    driver_family = '_legacy'
+
+    def _call(self, *, conparse):
+        tree_list = [[(clause.to_tree(), clause.delim,) for clause in sent] for sent in conparse]
+        return self._get_result_legacy(tree_list, coref_tree=self._get_coref_legacy(tree_list))
+
+    @classmethod
+    def _get_coref_legacy(cls, tree_list):  # pylint: disable=too-many-branches,too-many-locals
+        coref_tree = Tree()
+        coref_tree.create_node(identifier=0)
+        dummy_id = (-1, -1, -1)
+        coref_tree.create_node(identifier=dummy_id, parent=0, data=True)
+
+        name2node = {}
+        curr_source = None
+        last_source = None
+        last_subject = None
+        last_sent_pos = None
+
+        for sent_id, clause_list in enumerate(tree_list):
+            for clause_id, (tree, _) in enumerate(clause_list):
+                tree_key = (sent_id, clause_id,)
+                if tree is None:
+                    continue
+                curr_sent_pos = tree[tree.root].data.pos
+
+                appositions = []
+                for rel in tree.get_relations():
+                    if rel.relation.data.role in APPOSITION_ROLES:
+                        appositions.append(((rel.head.identifier, False), (rel.tail.identifier, False),))
+
+                node_keys = {}
+                for node_key in cls._get_sources(tree):
+                    node_keys[node_key] = True
+                for node_key in cls._get_targets(tree):
+                    node_keys[node_key] = False
+                subject_keys = set(cls._get_subjects(tree))
+
+                for node_key, ntype in sorted(node_keys.items()):
+                    if ntype:
+                        source = tree[node_key[0]]
+                        curr_source = (tree_key, node_key,)
+                        parent_id = name2node.get(source.data.word, None)
+                        if parent_id:
+                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=parent_id, data=True)
+                        else:
+                            name2node[source.data.word] = (tree_key, node_key,)
+                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=0, data=True)
+                    else:
+                        if node_key[1] and last_subject:
+                            coref_tree.create_node(identifier=(tree_key, node_key,), parent=last_subject, data=False)
+                        if not node_key[1]:
+                            if curr_source and tree[node_key[0]].data.word in SELF_WORDS:
+                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=curr_source, data=False)
+                            elif last_source:
+                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=last_source, data=False)
+                            else:
+                                coref_tree.create_node(identifier=(tree_key, node_key,), parent=dummy_id, data=False)
+
+                for head_key, tail_key in appositions:
+                    head_key = (tree_key, head_key,)
+                    tail_key = (tree_key, tail_key,)
+                    if coref_tree.contains(head_key) and coref_tree.contains(tail_key):
+                        if coref_tree.is_ancestor(head_key, tail_key) or coref_tree.is_ancestor(tail_key, head_key):
+                            continue
+                        if coref_tree[head_key].data:
+                            coref_tree.move_node(tail_key, head_key)
+                        elif coref_tree[tail_key].data:
+                            coref_tree.move_node(head_key, tail_key)
+                        else:
+                            coref_tree.move_node(tail_key, head_key)
+
+                if curr_sent_pos == 'NP' and last_sent_pos == 'NP' and last_subject:
+                    for node_key, ntype in node_keys.items():
+                        if ntype:
+                            source_id = (tree_key, node_key,)
+                            if coref_tree.contains(source_id):
+                                coref_tree.move_node(source_id, last_subject)
+
+                if curr_sent_pos in ('NP', 'S'):
+                    last_subject = None
+                    for node_key, ntype in sorted(node_keys.items(), key=lambda x: x[::-1]):
+                        if node_key in subject_keys:
+                            last_subject = (tree_key, node_key,)
+                            break
+
+                last_source = curr_source
+                last_sent_pos = curr_sent_pos
+
+        coref_tree.remove_node(dummy_id)
+        return coref_tree
+
+    @classmethod
+    def _get_result_legacy(cls, tree_list, *, coref_tree):
+        node2coref = {}
+        sources = set()
+        for ref_id, coref_source in enumerate(coref_tree.children(coref_tree.root)):
+            sources.add(coref_source.identifier)
+            for key in coref_tree.expand_tree(coref_source.identifier):
+                node2coref[key] = ref_id
+
+        return CorefParagraph(
+            cls._get_result(sent_id, clause_list, node2coref=node2coref, sources=sources)
+            for sent_id, clause_list in enumerate(tree_list)
+        )
+
+################################################################################################################################
+
+NAMES = ['畢卡索', '貝多芬', '馬克斯', '趙公明', '周穆王', '教宗',]
+
+TEMPLATES = [
+    ['S(agent:NP(apposition:Nba:{name}|Head:Nhaa:他)|Head:VE2:想)', ''],
+    ['S(agent:NP(Head:Nba:{name})|Head:VC31:看|goal:NP(Head:Nhaa:自己))', '，'],
+    ['S(agent:NP(Head:Nhaa:他)|Head:VE2:想|goal:NP(Head:Nba:{name}))', '。'],
+    ['S(agent:NP(Head:Nba:{name})|Head:VC31:看|goal:NP(Head:Nba:{name2}))', '，'],
+    ['VP(Head:VH11:完蛋|particle:Ta:了)', '！'],
+    ['VP(Head:Cbb:但是|Head:VE2:想)', '，'],
+    ['NP(Head:Nba:{name})', '，'],
+    ['NP(apposition:NP(Head:Nab:教宗)|Head:Nba:{name})', '。'],
+    ['%(particle:interjection(Head:I:啊)|time:Dh:哈)', '。'],
+    [None, '「'],
+]
+
+def make_conparse(num_sents=2000, seed=0):
+    rng = random.Random(seed)
+    conparse = []
+    for _ in range(num_sents):
+        sent = []
+        for _ in range(rng.randint(1, 4)):
+            clause, delim = rng.choice(TEMPLATES)
+            if clause is not None:
+                clause = clause.format(name=rng.choice(NAMES), name2=rng.choice(NAMES))
+            sent.append([clause, delim])
+        conparse.append(sent)
+    return ParseParagraph.from_list(conparse)
+
+def stream(conparse):
+    state = CorefState()
+    return [state.update(sent) for sent in conparse]
+
+def timing(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+################################################################################################################################
+
+def main():
+    conparse = make_conparse()
+
+    obj = CkipCorefChunker()
+    legacy = LegacyCorefChunker()
+    coref = obj(conparse=conparse)
+    assert coref == legacy(conparse=conparse)
+    num_mentions = sum(token.coref is not None for sent in coref for token in sent)
+    print(f'# {len(conparse)} sentences, {num_mentions} mentions')
+
+    legacy_sec = timing(lambda: legacy(conparse=conparse))
+    sec = timing(lambda: obj(conparse=conparse))
+    print(f'__call__            legacy {legacy_sec*1e3:8.2f} ms  union-find {sec*1e3:8.2f} ms')
+
+    # Streaming: resolve the whole history again for every new sentence, or update the state
+    history = conparse[:200]
+    legacy_sec = timing(lambda: [obj(conparse=ParseParagraph(history[:idx+1])) for idx in range(len(history))], number=1)
+    sec = timing(lambda: stream(history), number=1)
+    print(f'stream {len(history)} sents   rerun  {legacy_sec*1e3:8.2f} ms  CorefState {sec*1e3:8.2f} ms')
+
+if __name__ == '__main__':
+    main()
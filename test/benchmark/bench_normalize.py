@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""Benchmark of the half-width to full-width normalization of parser clauses.
+
+Usage: PYTHONPATH=../.. python3 bench_normalize.py
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+import random
+import timeit
+
+from ckipnlp.util.normalize import HALF2FULL, half2full
+
+################################################################################################################################
+
+def half2full_chain(text):
+    return text \
+       .replace('(', '（') \
+       .replace(')', '）') \
+       .replace('+', '＋') \
+       .replace('-', '－') \
+       .replace(':', '：') \
+       .replace('|', '｜')
+
+def make_paragraph(num_sents=2000, num_words=40, dirty_ratio=0.02, seed=0):
+    rng = random.Random(seed)
+    words = ['中文字', '耶', '啊', '哈哈', '完蛋', '了', '畢卡索', '他', '想', '但是', '也', '沒有', '辦法', '2020', 'abc',]
+    dirty_words = ['(', ')', 'F-16', '3+4', '12:30', 'a|b',]
+    return [
+        [rng.choice(dirty_words) if rng.random() < dirty_ratio else rng.choice(words) for _ in range(num_words)]
+        for _ in range(num_sents)
+    ]
+
+################################################################################################################################
+
+def main():
+    table = str.maketrans(HALF2FULL)
+
+    for dirty_ratio in (0.0, 0.02, 0.2,):
+        paragraph = make_paragraph(dirty_ratio=dirty_ratio)
+        assert [list(map(half2full_chain, sent)) for sent in paragraph] == \
+               [half2full.normalize_list(sent) for sent in paragraph]
+
+        print(f'# {len(paragraph)} sentences, {dirty_ratio:.0%} words with reserved characters')
+        for name, func in (
+            ('str.replace chain (per token)', lambda: [list(map(half2full_chain, sent)) for sent in paragraph]),
+            ('str.translate (per clause)', lambda: [
+                '\u3000'.join(sent).translate(table).split('\u3000') for sent in paragraph
+            ]),
+            ('TextNormalizer (per clause)', lambda: [half2full.normalize_list(sent) for sent in paragraph]),
+        ):
+            sec = min(timeit.repeat(func, number=5, repeat=3)) / 5
+            print(f'{name:32s}{sec*1e3:10.2f} ms / paragraph')
+
+if __name__ == '__main__':
+    main()
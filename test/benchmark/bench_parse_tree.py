@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""Benchmark of the memory and speed of the treelib-based and the compact parse trees.
+
+Usage: PYTHONPATH=../.. python3 bench_parse_tree.py
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+import gc
+import timeit
+import tracemalloc
+
+from ckipnlp.container.util.parse_tree import CompactParseTree, ParseRelation, ParseTree, ParseTreeAnalysis
+
+from bench_coref import make_conparse
+
+################################################################################################################################
+
+def from_text_legacy(data):
+    tree = ParseTree()
+    node_id = 0
+    node_stack = [None]
+    text = ''
+    ending = True
+
+    for char in data:
+        if char == '(':
+            node_data = ParseTree.node_class.data_class.from_text(text)
+            tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
+
+            node_stack.append(node_id)
+            node_id += 1
+            text = ''
+
+        elif char == ')':
+            if not ending:
+                node_data = ParseTree.node_class.data_class.from_text(text)
+                tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
+                node_id += 1
+
+            node_stack.pop()
+            text = ''
+            ending = True
+
+        elif char == '|':
+            if not ending:
+                node_data = ParseTree.node_class.data_class.from_text(text)
+                tree.create_node(tag=text, identifier=node_id, parent=node_stack[-1], data=node_data)
+                node_id += 1
+
+            text = ''
+            ending = True
+
+        else:
+            ending = False
+            text += char
+
+    return tree
+
+def get_heads_legacy(tree, root_id, *, semantic=True, deep=True):
+    children = tree.children(root_id)
+    head_nodes = [] if children else [tree[root_id]]
+    if semantic:
+        if not head_nodes:
+            head_nodes = [child for child in children if child.data.role in ('DUMMY', 'DUMMY1', 'DUMMY2',)]
+        if not head_nodes:
+            head_nodes = [child for child in children if child.data.role == 'head']
+    if not head_nodes:
+        head_nodes = [child for child in children if child.data.role == 'Head']
+    if not head_nodes:
+        head_nodes = [children[-1]]
+
+    for node in head_nodes:
+        if deep and not node.is_leaf():
+            yield from get_heads_legacy(tree, node.identifier, semantic=semantic)
+        else:
+            yield node
+
+def get_relations_legacy(tree, root_id, *, semantic=True):
+    children = tree.children(root_id)
+    head_children = list(get_heads_legacy(tree, root_id, semantic=semantic, deep=False))
+    for head_node in get_heads_legacy(tree, root_id, semantic=semantic):
+        for tail in children:
+            if tail.data.role != 'Head' and tail not in head_children:
+                if tail.is_leaf():
+                    yield ParseRelation(head=head_node, tail=tail, relation=tail)  # pylint: disable=no-value-for-parameter
+                else:
+                    for node in get_heads_legacy(tree, tail.identifier, semantic=semantic):
+                        yield ParseRelation(head=head_node, tail=node, relation=tail)  # pylint: disable=no-value-for-parameter
+    for child in children:
+        yield from get_relations_legacy(tree, child.identifier, semantic=semantic)
+
+def to_text_legacy(tree, node_id):
+    tree_text = tree[node_id].data.to_text()
+    children_text = '|'.join((to_text_legacy(tree, child.identifier) for child in tree.children(node_id)))
+    if children_text:
+        tree_text = '{}({})'.format(tree_text, children_text)
+    return tree_text
+
+def to_penn_legacy(tree, node_id):
+    node = tree[node_id]
+    penn_data = [f'{node.data.role}:{node.data.pos}' if node.data.role else node.data.pos,]
+    if node.data.word:
+        penn_data.append(node.data.word)
+    for child in tree.children(node_id):
+        penn_data.append(to_penn_legacy(tree, child.identifier))
+    return penn_data
+
+def make_deep_clause(depth=200):
+    """A clause with a head chain of **depth** NPs."""
+    return 'NP(' + 'Head:NP(' * depth + 'Head:Nab:早餐' + '|property:Nab:午餐)' * (depth+1)
+
+def cold(tree):
+    """Drop the cached analyses of **tree**."""
+    tree._analyses = None  # pylint: disable=protected-access
+    return tree
+
+def make_clauses(num_sents=20000, seed=0):
+    return [clause.clause for sent in make_conparse(num_sents, seed) for clause in sent if clause.clause]
+
+def memory(func):
+    gc.collect()
+    tracemalloc.start()
+    obj = func()  # pylint: disable=unused-variable
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+def timing(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+################################################################################################################################
+
+def main():
+    clauses = make_clauses()
+    num_nodes = sum(len(ParseTree.from_text(clause)) for clause in clauses)
+    print(f'# {len(clauses)} clauses, {num_nodes} nodes')
+
+    trees = {
+        'treelib': [ParseTree.from_text(clause) for clause in clauses],
+        'compact': [CompactParseTree.from_text(clause) for clause in clauses],
+    }
+    for clause, tree0, tree1 in zip(clauses, trees['treelib'], trees['compact']):
+        assert tree0.to_dict() == tree1.to_dict() == from_text_legacy(clause).to_dict()
+
+    def report(name, results):
+        print(f'{name:20s}' + ''.join(f'  {key} {value:10.2f}' for key, value in results.items()))
+
+    report('memory (MB)', {
+        'treelib': memory(lambda: [ParseTree.from_text(clause) for clause in clauses]) / 2**20,
+        'compact': memory(lambda: [CompactParseTree.from_text(clause) for clause in clauses]) / 2**20,
+    })
+    report('from_text (ms)', {
+        'legacy': timing(lambda: [from_text_legacy(clause) for clause in clauses]) * 1e3,
+        'treelib': timing(lambda: [ParseTree.from_text(clause) for clause in clauses]) * 1e3,
+        'compact': timing(lambda: [CompactParseTree.from_text(clause) for clause in clauses]) * 1e3,
+    })
+    report('to_text (ms)', {
+        'legacy': timing(lambda: [to_text_legacy(tree, tree.root) for tree in trees['treelib']]) * 1e3,
+        **{
+            key: timing(lambda: [tree.to_text() for tree in tree_list]) * 1e3  # pylint: disable=cell-var-from-loop
+            for key, tree_list in trees.items()
+        },
+    })
+    report('to_penn (ms)', {
+        'legacy': timing(lambda: [to_penn_legacy(tree, tree.root) for tree in trees['treelib']]) * 1e3,
+        **{
+            key: timing(lambda: [tree.to_penn() for tree in tree_list]) * 1e3  # pylint: disable=cell-var-from-loop
+            for key, tree_list in trees.items()
+        },
+    })
+    for tree in trees['treelib']:
+        for semantic in (True, False,):
+            for node_id in tree.nodes:
+                assert list(tree.get_heads(node_id, semantic=semantic)) \
+                    == list(get_heads_legacy(tree, node_id, semantic=semantic))
+                assert list(tree.get_relations(node_id, semantic=semantic)) \
+                    == list(get_relations_legacy(tree, node_id, semantic=semantic))
+
+    report('get_relations (ms)', {
+        'legacy': timing(lambda: [list(get_relations_legacy(tree, tree.root)) for tree in trees['treelib']]) * 1e3,
+        **{
+            key: timing(lambda: [list(cold(tree).get_relations(tree.root)) for tree in tree_list]) * 1e3  # pylint: disable=cell-var-from-loop
+            for key, tree_list in trees.items()
+        },
+    })
+
+    deep_clause = make_deep_clause()
+    deep_trees = {'treelib': ParseTree.from_text(deep_clause), 'compact': CompactParseTree.from_text(deep_clause)}
+    assert list(deep_trees['treelib'].get_relations()) == list(get_relations_legacy(deep_trees['treelib'], 0))
+    assert deep_trees['treelib'].to_text() == deep_trees['compact'].to_text() == deep_clause
+    print(f'# deep clause, {len(deep_trees["treelib"])} nodes')
+    report('deep to_text (ms)', {
+        'legacy': timing(lambda: to_text_legacy(deep_trees['treelib'], 0)) * 1e3,
+        **{key: timing(tree.to_text) * 1e3 for key, tree in deep_trees.items()},
+    })
+    report('deep relations (ms)', {
+        'legacy': timing(lambda: list(get_relations_legacy(deep_trees['treelib'], 0))) * 1e3,
+        **{
+            key: timing(lambda: list(cold(tree).get_relations())) * 1e3  # pylint: disable=cell-var-from-loop
+            for key, tree in deep_trees.items()
+        },
+    })
+    report('analysis (ms)', {
+        key: timing(lambda: [ParseTreeAnalysis(tree) for tree in tree_list]) * 1e3  # pylint: disable=cell-var-from-loop
+        for key, tree_list in trees.items()
+    })
+    report('get_subjects (ms)', {
+        key: timing(lambda: [list(cold(tree).get_subjects(tree.root)) for tree in tree_list]) * 1e3  # pylint: disable=cell-var-from-loop
+        for key, tree_list in trees.items()
+    })
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""Benchmark of the sentence segmentation on multi-megabyte inputs.
+
+Usage: PYTHONPATH=../.. python3 bench_ss.py
+"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+import random
+import re
+import timeit
+
+from ckipnlp.driver import CkipSentenceSegmenter
+
+################################################################################################################################
+
+def segment_legacy(raw, delims, keep_delims):
+    if not keep_delims:
+        text = re.sub(rf'[^\S{delims}]', '', raw)
+        text = re.split(rf'[{delims}]+', text)
+        text = filter(None, text)
+    else:
+        text = re.split(rf'([{delims}]+)', raw)
+        if text[-1] == '':
+            del text[-1]
+        if len(text) % 2:
+            text.append('')
+        text = [word+punct for word, punct in zip(text[::2], text[1::2])]
+    return list(text)
+
+def make_raw(num_sents=100000, seed=0):
+    rng = random.Random(seed)
+    chars = '中文字耶啊哈完蛋了畢卡索他想但是也沒有辦法，、 '
+    return ''.join(
+        ''.join(rng.choices(chars, k=rng.randint(5, 60))) + rng.choice(['\n', '\n\n', '。', '！\n',])
+        for _ in range(num_sents)
+    )
+
+def timing(func, number=3):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+################################################################################################################################
+
+def main():
+    raw = make_raw()
+    delims = '\n。！'
+    print(f'# {len(raw)/1e6:.1f}M characters')
+
+    for keep_delims in (False, True,):
+        obj = CkipSentenceSegmenter(delims=delims, keep_delims=keep_delims)
+        assert obj(raw=raw).to_list() == segment_legacy(raw, delims, keep_delims)
+
+        legacy_sec = timing(lambda: segment_legacy(raw, delims, keep_delims))
+        sec = timing(lambda: obj(raw=raw))
+        print(f'keep_delims={keep_delims!s:5s}  legacy {legacy_sec*1e3:8.2f} ms  engine {sec*1e3:8.2f} ms')
+
+    obj = CkipSentenceSegmenter(delims=['\n', '。」', '。', '！',], keep_delims=True)
+    sec = timing(lambda: obj(raw=raw))
+    print(f'multi-character delimiters          engine {sec*1e3:8.2f} ms')
+
+    raw = raw * 10
+    print(f'# {len(raw)/1e6:.1f}M characters')
+    obj = CkipSentenceSegmenter(delims=delims)
+    expected = obj(raw=raw)
+    sec = timing(lambda: obj(raw=raw), number=1)
+    print(f'serial                              engine {sec*1e3:8.2f} ms')
+    for workers in (2, 4,):
+        obj = CkipSentenceSegmenter(delims=delims, workers=workers)
+        assert obj(raw=raw) == expected
+        sec = timing(lambda: obj(raw=raw), number=1)  # pylint: disable=cell-var-from-loop
+        print(f'workers={workers}                           engine {sec*1e3:8.2f} ms')
+
+if __name__ == '__main__':
+    main()
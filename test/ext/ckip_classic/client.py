@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+"""The dummy CkipClassic Client package"""
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+from .parser import wspos2parser
+
+################################################################################################################################
+
+wspos2client = {
+    **wspos2parser,
+    '啊(I)　哈(D)　哈哈(D)': ['#2:1.[0] %(particle:interjection(Head:I:啊)|time:Dh:哈|time:D:哈哈)#',],
+}
+
+################################################################################################################################
+
+class CkipParserClient:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def apply_list(self, wspos):
+        for line in wspos:
+            return self(line)
+
+    def __call__(self, wspos):
+        if wspos in wspos2client:
+            return wspos2client[wspos]
+        else:
+            raise NotImplementedError(wspos)
@@ -17,6 +17,7 @@ wspos2parser = {
     '完蛋(VH)　了(T)': ['#3:1.[0] VP(Head:VH11:完蛋|particle:Ta:了)#',],
     '畢卡索(Nb)　他(Nh)　想(VE)': ['#4:1.[0] S(agent:NP(apposition:Nba:畢卡索|Head:Nhaa:他)|Head:VE2:想)#',],
     '但是(Cbb)　也(D)　沒有(VJ)　辦法(Na)': ['#5:1.[0] VP(contrast:Cbca:但是|evaluation:Dbb:也|Head:VJ3:沒有|range:NP(Head:Nac:辦法))#',],
+    '天氣(Na)　很(Dfa)　好(VH)': ['#6:1.[0] S(theme:NP(Head:Nad:天氣)|degree:Dfa:很|Head:VH11:好)#',],
 }
 
 ################################################################################################################################
@@ -7,8 +7,6 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
-import numpy as np
-
 ################################################################################################################################
 
 base_text = [
@@ -28,7 +26,8 @@ class CkipWs:
         pass
 
     def apply_list(self, text):
-        if np.array_equal(text, base_text):
-            return base_wspos
+        text2wspos = dict(zip(base_text, base_wspos))
+        if all(line in text2wspos for line in text):
+            return [text2wspos[line] for line in text]
         else:
             raise NotImplementedError(text)
@@ -7,8 +7,6 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
-import numpy as np
-
 ################################################################################################################################
 
 base_text = [
@@ -33,22 +31,30 @@ base_ner = [
 coref_text = [
     '「完蛋了！」畢卡索他想',
     '但是也沒有辦法',
+    '天氣很好',
 ]
 coref_ws = [
     [ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ],
     [ '但是', '也', '沒有', '辦法', ],
+    [ '天氣', '很', '好', ],
 ]
 coref_pos = [
     [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'Nb', 'Nh', 'VE', ],
     [ 'Cbb', 'D', 'VJ', 'Na', ],
+    [ 'Na', 'Dfa', 'VH', ],
 ]
 coref_ner = [
     [ (6, 9, 'PERSON', '畢卡索',), ],
     [],
+    [],
 ]
 
 ################################################################################################################################
 
+text2ws = dict(zip(base_text + coref_text, base_ws + coref_ws))
+ws2pos = dict(zip(map(tuple, base_ws + coref_ws), base_pos + coref_pos))
+wspos2ner = dict(zip(zip(map(tuple, base_ws + coref_ws), map(tuple, base_pos + coref_pos)), base_ner + coref_ner))
+
 def construct_dictionary(*args, **kwargs):
     return {}
 
@@ -60,11 +66,9 @@ class WS:
         pass
 
     def __call__(self, text):
-        if np.array_equal(text, base_text):
-            return base_ws
-        elif np.array_equal(text, coref_text):
-            return coref_ws
-        else:
+        try:
+            return [text2ws[sent] for sent in text]
+        except KeyError:
             raise NotImplementedError(text)
 
 ################################################################################################################################
@@ -75,11 +79,9 @@ class POS:
         pass
 
     def __call__(self, ws):
-        if np.array_equal(ws, base_ws):
-            return base_pos
-        elif np.array_equal(ws, coref_ws):
-            return coref_pos
-        else:
+        try:
+            return [ws2pos[tuple(ws_sent)] for ws_sent in ws]
+        except KeyError:
             raise NotImplementedError(ws)
 
 ################################################################################################################################
@@ -90,9 +92,7 @@ class NER:
         pass
 
     def __call__(self, ws, pos):
-        if np.array_equal(ws, base_ws) and np.array_equal(pos, base_pos):
-            return base_ner
-        elif np.array_equal(ws, coref_ws) and np.array_equal(pos, coref_pos):
-            return coref_ner
-        else:
+        try:
+            return [wspos2ner[tuple(ws_sent), tuple(pos_sent)] for ws_sent, pos_sent in zip(ws, pos)]
+        except KeyError:
             raise NotImplementedError((ws, pos,))
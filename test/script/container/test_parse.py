@@ -5,9 +5,11 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import pickle
+
 from _base import _TestBase
 from ckipnlp.container.parse import *
-from ckipnlp.container.util.parse_tree import ParseTree
+from ckipnlp.container.util.parse_tree import CompactParseTree, ParseTree
 
 ################################################################################################################################
 
@@ -44,6 +46,29 @@ class TestParseClause(_TestBase):
         tree_out = obj.to_tree()
         assert tree_out is None
 
+    def test_tree(self):
+        obj = self.obj_class.from_list(self.list_in)
+        tree_out = obj.tree
+        assert isinstance(tree_out, CompactParseTree)
+        assert tree_out.to_text() == self.list_in[0]
+        assert obj.tree is tree_out
+        assert self.obj_class().tree is None
+
+    def test_tree_replace(self):
+        obj = self.obj_class.from_list(self.list_in)
+        tree_out = obj.tree
+        obj_out = obj._replace(clause='NP(Head:Nab:中文字)')  # pylint: disable=no-member
+        assert obj_out.tree is not tree_out
+        assert obj_out.tree.to_text() == 'NP(Head:Nab:中文字)'
+
+    def test_tree_pickle(self):
+        obj = self.obj_class.from_list(self.list_in)
+        tree_out = obj.tree
+        obj_out = pickle.loads(pickle.dumps(obj))
+        assert obj_out == obj
+        assert obj_out.tree is not tree_out
+        assert obj_out.tree.to_dict() == tree_out.to_dict()
+
 ################################################################################################################################
 
 class TestParseSentence(_TestBase):
@@ -79,6 +104,21 @@ class TestParseSentence(_TestBase):
         assert obj[1].clause == self.list_in[1][0]
         assert obj[1].delim == self.list_in[1][1]
 
+    def test_trees(self):
+        obj = self.obj_class.from_list(self.list_in)
+        trees_out = obj.trees
+        assert [tree.to_text() for tree in trees_out] == [clause for clause, _ in self.list_in]
+        assert all(tree0 is tree1 for tree0, tree1 in zip(obj.trees, trees_out))
+
+    def test_write_penn(self):
+        obj = self.obj_class.from_list(self.list_in)
+        buffer = []
+        obj.write_penn(buffer, with_role=False)
+        assert ''.join(buffer) == (
+            '(S (Nab 中文字) (Td 耶))\n'
+            '(% (I 啊) (Dh 哈) (Dh 哈) (Dh 哈))\n'
+        )
+
 ################################################################################################################################
 
 class TestParseParagraph(_TestBase):
@@ -147,3 +187,16 @@ class TestParseParagraph(_TestBase):
         assert len(obj[1][2]) == 2
         assert obj[1][2].clause == self.list_in[1][2][0]
         assert obj[1][2].delim == self.list_in[1][2][1]
+
+    def test_write_penn(self):
+        obj = self.obj_class.from_list(self.list_in)
+        buffer = []
+        obj.write_penn(buffer, with_role=False)
+        assert ''.join(buffer) == (
+            '(S (Nab 中文字) (Td 耶))\n'
+            '(% (I 啊) (Dh 哈) (Dh 哈) (Dh 哈))\n'
+            '\n'
+            '(VP (VH11 完蛋) (Ta 了))\n'
+            '(S (NP (Nba 畢卡索) (Nhaa 他)) (VE2 想))\n'
+            '\n'
+        )
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+
+__author__ = 'Mu Yang <http://muyang.pro>'
+__copyright__ = '2018-2023 CKIP Lab'
+__license__ = 'GPL-3.0'
+
+from ckipnlp.container.seg import SegParagraph
+from ckipnlp.container.util.clause import *
+
+################################################################################################################################
+
+ws = [
+    [ '中文字', '耶', '，', '啊', '哈', '哈哈', '。', ],
+    [ '「', '完蛋', '了', '！', '」', '畢卡索', ' ', '他', '想', ],
+    [],
+]
+pos = [
+    [ 'Na', 'T', 'COMMACATEGORY', 'I', 'D', 'D', 'PERIODCATEGORY', ],
+    [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'Nb', 'WHITESPACE', 'Nh', 'VE', ],
+    [],
+]
+
+def test_segment_clauses():
+    clauses_list = segment_clauses(ws=SegParagraph.from_list(ws), pos=SegParagraph.from_list(pos))
+    assert clauses_list == [
+        [
+            ClauseSpan(idxs=(0, 1,), start=0, end=3, delim='，'),
+            ClauseSpan(idxs=(3, 4, 5,), start=3, end=7, delim='。'),
+        ],
+        [
+            ClauseSpan(idxs=None, start=0, end=1, delim='「'),
+            ClauseSpan(idxs=(1, 2,), start=1, end=5, delim='！」'),
+            ClauseSpan(idxs=(5, 7, 8,), start=5, end=9, delim=''),
+        ],
+        [],
+    ]
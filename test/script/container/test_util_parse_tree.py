@@ -5,6 +5,12 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import json
+import pickle
+import pytest
+
+from treelib.exceptions import MultipleRootError
+
 from _base import _TestBase
 from ckipnlp.container.util.parse_tree import *
 
@@ -289,6 +295,58 @@ class TestParseTree(_TestBase):
         obj = self.obj_class.from_text(self.text_in)
         assert str(obj) == self.text_in
 
+    def test_write_text(self):
+        obj = self.obj_class.from_text(self.text_in)
+        buffer = ['#']
+        obj.write_text(buffer)
+        obj.write_text(buffer, 13)
+        assert ''.join(buffer) == '#' + self.text_in + 'condition:PP(Head:P21:在|DUMMY:GP(DUMMY:NP(Head:Nac:比賽)|Head:Ng:中))'
+
+    def test_write_penn(self):
+        obj = self.obj_class.from_text(self.text_in)
+        buffer = []
+        obj.write_penn(buffer, 13)
+        assert ''.join(buffer) == '(condition:PP (Head:P21 在) (DUMMY:GP (DUMMY:NP (Head:Nac 比賽)) (Head:Ng 中)))'
+
+        buffer = []
+        obj.write_penn(buffer, 13, with_role=False, with_word=False)
+        assert ''.join(buffer) == '(PP (P21) (GP (NP (Nac)) (Ng)))'
+
+    def test_deep_tree(self):
+        depth = 5000
+        text_in = 'NP(' + 'Head:NP(' * depth + 'Head:Nab:早餐' + ')' * (depth+1)
+        obj = self.obj_class.from_text(text_in)
+        assert obj.to_text() == text_in
+
+        tree_dict = obj.to_dict()
+        for node_id in range(depth+1):
+            assert tree_dict['id'] == node_id
+            tree_dict, = tree_dict['children']
+        assert tree_dict['data']['word'] == '早餐'
+
+        penn_data = obj.to_penn()
+        for _ in range(depth+1):
+            _, penn_data = penn_data
+        assert penn_data == ['Head:Nab', '早餐']
+
+    def test_from_text_node_ids(self):
+        obj = self.obj_class.from_text(self.text_in)
+        assert obj.root == 0
+        assert len(obj) == 23
+        assert [node.identifier for node in obj.children(13)] == [14, 15]
+        assert obj.parent(17).identifier == 16
+        assert obj.parent(0) is None
+
+    def test_from_text_malformed(self):
+        with pytest.raises(TypeError):
+            self.obj_class.from_text('Head:Nab:a:Nab:b(S')
+        with pytest.raises(IndexError):
+            self.obj_class.from_text('S)(NP')
+
+    def test_from_text_multiple_roots(self):
+        with pytest.raises(MultipleRootError):
+            self.obj_class.from_text('S|NP(')
+
     def test_get_heads_semantic(self):
         obj = self.obj_class.from_text(self.text_in)
         self._assert_get_heads(obj, 0, [21], semantic=True)
@@ -360,6 +418,75 @@ class TestParseTree(_TestBase):
         }
         assert rels_id_out == rels_id
 
+    def test_get_relations_subtree(self):
+        obj = self.obj_class.from_text(self.text_in)
+        assert [
+            (rel.head.identifier, rel.tail.identifier, rel.relation.data.role) for rel in obj.get_relations(1)
+        ] == [
+            (7, 3, 'possessor',),
+            (9, 3, 'possessor',),
+            (11, 3, 'possessor',),
+        ]
+        assert [
+            (rel.head.identifier, rel.tail.identifier, rel.relation.data.role) for rel in obj.get_relations(1, semantic=False)
+        ] == [
+            (10, 4, 'possessor',),
+            (4, 3, 'head',),
+            (10, 8, 'DUMMY1',),
+            (10, 11, 'DUMMY2',),
+            (8, 7, 'DUMMY1',),
+            (8, 9, 'DUMMY2',),
+        ]
+        assert list(obj.get_relations(3)) == []
+
+    def test_find(self):
+        obj = self.obj_class.from_text(self.text_in)
+        assert obj.index is obj.index
+
+        def find_ids(*args, **kwargs):
+            return [node.identifier for node in obj.find(*args, **kwargs)]
+
+        assert find_ids() == list(range(23))
+        assert find_ids(13) == [13, 14, 15, 16, 17, 18]
+        assert find_ids(pos_prefix='N') == [1, 2, 3, 5, 6, 7, 9, 11, 16, 17, 18]
+        assert find_ids(role='Head') == [4, 5, 8, 10, 14, 17, 18, 20, 21]
+        assert find_ids(pos_prefix='N', role_in={'DUMMY1', 'DUMMY2'}) == [6, 7, 9, 11]
+        assert find_ids(13, role='DUMMY') == [15, 16]
+        assert find_ids(pos='Nab', role='Head') == [5]
+        assert find_ids(pos_in=('P21', 'P02',)) == [14, 20]
+        assert find_ids(pos_prefix='N', role='agent') == []
+        assert find_ids(pos_prefix='X') == []
+
+    def test_analysis(self):
+        obj = self.obj_class.from_text(self.text_in)
+        analysis = obj.analysis
+        assert obj.analysis is analysis
+        assert analysis.leaves == obj.leaves()
+        for node_id in obj.nodes:
+            assert list(analysis.heads[node_id]) == list(obj.get_heads(node_id))
+        assert list(analysis.relations) == list(obj.get_relations(obj.root))
+        assert list(analysis.subjects) == list(obj.get_subjects(obj.root))
+
+    def test_get_relations_uncached(self):
+        obj = self.obj_class.from_text(self.text_in)
+        for semantic in (True, False,):
+            analysis = ParseTreeAnalysis(obj, semantic=semantic)
+            for node_id in obj.nodes:
+                assert list(obj.get_relations(node_id, semantic=semantic)) == list(analysis.get_relations(node_id))
+        assert getattr(obj, '_analyses', None) is None
+
+    def test_analysis_invalidate(self):
+        obj = self.obj_class.from_text(self.text_in)
+        analysis = obj.analysis
+        index = obj.index
+        obj.remove_node(22)
+        assert obj.analysis is not analysis
+        assert obj.index is not index
+        assert 22 not in [node.identifier for node in obj.find(role='aspect')]
+        assert (21, 22, 'aspect',) not in {
+            (rel.head.identifier, rel.tail.identifier, rel.relation.data.role) for rel in obj.get_relations()
+        }
+
     ########################################################################################################################
 
     def test_node_repr(self):
@@ -388,3 +515,40 @@ class TestParseTree(_TestBase):
             },
             'relation': 'possessor',
         }
+
+################################################################################################################################
+
+class TestCompactParseTree(TestParseTree):
+
+    obj_class = CompactParseTree
+
+    test_analysis_invalidate = NotImplemented
+
+    def test_node_repr(self):
+        obj = self.obj_class.from_text(self.text_in)
+        assert isinstance(obj[3], CompactParseNode)
+        assert repr(obj[3]) == 'CompactParseNode(tag=head:Nhaa:我, identifier=3)'
+
+    def test_parse_tree(self):
+        obj = self.obj_class.from_text(self.text_in)
+        tree = obj.to_parse_tree()
+        assert isinstance(tree, ParseTree)
+        assert tree.to_dict() == obj.to_dict()
+        assert self.obj_class.from_parse_tree(tree).to_dict() == obj.to_dict()
+
+    def test_from_text_multiple_roots(self):
+        with pytest.raises(ValueError):
+            self.obj_class.from_text('S|NP(')
+
+    def test_pickle(self):
+        obj = self.obj_class.from_text(self.text_in)
+        state = obj.__getstate__()
+        assert state['_roles'][:2] == [None, 'goal']  # pickled as strings, not as the process-local symbol IDs
+        obj_out = pickle.loads(pickle.dumps(obj))
+        assert obj_out.to_dict() == obj.to_dict()
+
+    def test_from_dict_node_ids(self):
+        dict_in = json.loads(self.json_in)
+        dict_in['children'][0]['id'] = 2
+        with pytest.raises(ValueError):
+            self.obj_class.from_dict(dict_in)
@@ -104,3 +104,16 @@ class TestWsPosParagraph(_TestBase):
 
         assert len(pos_obj[1]) == 9
         assert pos_obj[1] == [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'COMMACATEGORY', 'Nb', 'Nh', 'VE', ]
+
+    def test_decoder(self):
+        decoder = WsPosDecoder()
+        for line in self.text_in:
+            decoder.feed([line])
+        assert len(decoder) == 2
+        word_obj, pos_obj = decoder.result()
+        self._assert_body(word_obj, pos_obj)
+
+    def test_from_text_irregular(self):
+        word_obj, pos_obj = self.obj_class.from_text([' 中文字(Na) 　)(PARENTHESISCATEGORY)　(((PARENTHESISCATEGORY))'])
+        assert word_obj == [ [ '中文字', '', '((', ], ]
+        assert pos_obj == [ [ 'Na', 'PARENTHESISCATEGORY', 'PARENTHESISCATEGORY', ], ]
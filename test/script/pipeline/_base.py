@@ -16,6 +16,7 @@ except:
 from ckipnlp.pipeline import *
 from ckipnlp.driver import *
 from ckipnlp.container import *
+from ckipnlp.util.cache import *
 
 ################################################################################################################################
 
@@ -5,6 +5,9 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import sys
+import pytest
+
 from _base import *
 
 def test_classic_con_parser():
@@ -22,3 +25,30 @@ def test_classic_con_parser():
             [ 'S(agent:NP(apposition:Nba:畢卡索|Head:Nhaa:他)|Head:VE2:想)', '', ],
         ],
     ]
+
+def test_classic_pool_con_parser():
+    obj = CkipPipeline(con_parser='classic-pool', opts={'con_parser': {'workers': 2}})
+    doc = CkipDocument(ws=SegParagraph.from_list(ws), pos=SegParagraph.from_list(pos))
+    obj.get_conparse(doc)
+    assert doc.conparse.to_list() == [
+        [
+            [ 'S(Head:Nab:中文字|particle:Td:耶)', '，', ],
+            [ '%(particle:I:啊|manner:Dh:哈|manner:D:哈哈)', '。', ],
+        ],
+        [
+            [ None, '「', ],
+            [ 'VP(Head:VH11:完蛋|particle:Ta:了)', '！」', ],
+            [ 'S(agent:NP(apposition:Nba:畢卡索|Head:Nhaa:他)|Head:VE2:想)', '', ],
+        ],
+    ]
+
+def test_classic_pool_con_parser_close():
+    with CkipClassicConParserPool(workers=2) as obj:
+        conparse_out = obj(ws=SegParagraph.from_list(ws), pos=SegParagraph.from_list(pos))
+        assert conparse_out[1][2].clause == 'S(agent:NP(apposition:Nba:畢卡索|Head:Nhaa:他)|Head:VE2:想)'
+    assert obj._core is None  # pylint: disable=protected-access
+
+def test_classic_pool_con_parser_missing_backend(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'ckip_classic.parser', None)
+    with pytest.raises(ImportError):
+        CkipClassicConParserPool(workers=2)
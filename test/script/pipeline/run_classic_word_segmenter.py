@@ -5,6 +5,9 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import sys
+import pytest
+
 from _base import *
 
 def test_classic_word_segmenter():
@@ -15,3 +18,24 @@ def test_classic_word_segmenter():
         [ '中文字', '耶', '，', '啊哈', '哈哈', '。', ],
         [ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ],
     ]
+
+def test_classic_pool_word_segmenter():
+    obj = CkipPipeline(word_segmenter='classic-pool', opts={'word_segmenter': {'workers': 2}})
+    doc = CkipDocument(text=TextParagraph.from_list(text))
+    obj.get_ws(doc)
+    assert doc.ws.to_list() == [
+        [ '中文字', '耶', '，', '啊哈', '哈哈', '。', ],
+        [ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ],
+    ]
+
+def test_classic_pool_word_segmenter_close():
+    with CkipPipeline(word_segmenter='classic-pool', opts={'word_segmenter': {'workers': 2}}) as obj:
+        doc = CkipDocument(text=TextParagraph.from_list(text))
+        obj.get_ws(doc)
+        assert doc.ws[1].to_list() == [ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ]
+    assert obj._word_segmenter._core is None  # pylint: disable=protected-access
+
+def test_classic_pool_word_segmenter_missing_backend(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'ckip_classic.ws', None)
+    with pytest.raises(ImportError):
+        CkipClassicWordSegmenterPool(workers=2)
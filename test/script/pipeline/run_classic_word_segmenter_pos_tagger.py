@@ -22,3 +22,19 @@ def test_classic_word_segmenter_pos_tagger():
         [ 'Na', 'T', 'COMMACATEGORY', 'I', 'D', 'PERIODCATEGORY', ],
         [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'Nb', 'Nh', 'VE', ],
     ]
+
+def test_classic_pool_word_segmenter_pos_tagger():
+    obj = CkipPipeline(word_segmenter='classic-pool', pos_tagger='classic-pool', opts={'word_segmenter': {'workers': 2}})
+    doc = CkipDocument(text=TextParagraph.from_list(text))
+
+    obj.get_ws(doc)
+    assert doc.ws.to_list() == [
+        [ '中文字', '耶', '，', '啊哈', '哈哈', '。', ],
+        [ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ],
+    ]
+
+    obj.get_pos(doc)
+    assert doc.pos.to_list() == [
+        [ 'Na', 'T', 'COMMACATEGORY', 'I', 'D', 'PERIODCATEGORY', ],
+        [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'Nb', 'Nh', 'VE', ],
+    ]
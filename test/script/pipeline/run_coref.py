@@ -5,6 +5,8 @@ __author__ = 'Mu Yang <http://muyang.pro>'
 __copyright__ = '2018-2023 CKIP Lab'
 __license__ = 'GPL-3.0'
 
+import pytest
+
 from _base import *
 
 ################################################################################################################################
@@ -36,3 +38,69 @@ def test_coref_chunker():
     doc = CkipDocument(raw=raw)
     corefdoc = obj(doc)
     assert corefdoc.coref.to_list() == coref
+
+def test_coref_chunker_reuse_pos():
+    obj = CkipCorefPipeline(pos_tagger=None)
+    doc = CkipDocument(
+        raw=raw,
+        ws=SegParagraph.from_list([[ '「', '完蛋', '了', '！', '」', '畢卡索', '他', '想', ], [ '但是', '也', '沒有', '辦法', ],]),
+        pos=SegParagraph.from_list([
+            [ 'PARENTHESISCATEGORY', 'VH', 'T', 'EXCLAMATIONCATEGORY', 'PARENTHESISCATEGORY', 'Nb', 'Nh', 'VE', ],
+            [ 'Cbb', 'D', 'VJ', 'Na', ],
+        ]),
+    )
+    corefdoc = obj(doc)
+    assert corefdoc.pos.to_list() == doc.pos.to_list()
+    assert corefdoc.coref.to_list() == coref
+
+def test_coref_chunker_prefilter():
+    corefdoc = CkipCorefPipeline(prefilter=True)(CkipDocument(raw=raw))
+    assert corefdoc.conparse[0][1].clause == 'VP(Head:VH11:完蛋|particle:Ta:了)'  # zero subject
+    assert corefdoc.coref.to_list() == CkipCorefPipeline()(CkipDocument(raw=raw)).coref.to_list() == coref
+
+def test_coref_chunker_prefilter_unparsed():
+    raw3 = '「完蛋了！」畢卡索他想\n天氣很好\n但是也沒有辦法'
+    obj = CkipCorefPipeline(prefilter=True)
+    corefdoc = obj(CkipDocument(raw=raw3))
+    assert corefdoc.conparse[1].to_list() == [ [ None, '天氣很好', ], ]
+    assert corefdoc.coref[1].to_list() == [ [ '天氣很好', None, (0, None), ], ]
+
+    coref_full = CkipCorefPipeline()(CkipDocument(raw=raw3)).coref.to_list()
+    assert corefdoc.coref[0].to_list() == coref_full[0]
+    assert corefdoc.coref[2].to_list() == coref_full[2] == [  # the subject is reset by the unparsed clause
+        [ '但是', None, (0, 1), ],
+        [ '也', None, (0, 2), ],
+        [ '沒有', None, (0, 3), ],
+        [ '辦法', None, (0, 5), ],
+    ]
+
+    coref_stale = obj._coref_chunker(conparse=corefdoc.conparse).to_list()  # pylint: disable=protected-access
+    assert coref_stale[2][1] == [ None, (0, 'zero'), (0, None), ]
+
+def test_coref_chunker_many():
+    raws = [ raw, '但是也沒有辦法\n「完蛋了！」畢卡索他想', '天氣很好\n但是也沒有辦法', ]
+    for prefilter in (False, True,):
+        obj = CkipCorefPipeline(prefilter=prefilter)
+        corefdocs = obj.process_many([CkipDocument(raw=raw_) for raw_ in raws])
+        corefdocs_single = [obj(CkipDocument(raw=raw_)) for raw_ in raws]
+        for key in ('ws', 'pos', 'conparse', 'coref',):
+            assert [corefdoc[key].to_list() for corefdoc in corefdocs] == \
+                [corefdoc[key].to_list() for corefdoc in corefdocs_single]
+        assert all(token.coref is None for token in corefdocs[1].coref[0])
+
+def test_coref_chunker_transform_out_of_range():
+    text_obj = TextParagraph.from_list(text)
+    ws_obj = SegParagraph.from_list(ws)
+    ner_obj = NerParagraph.from_list([ [ [ '哈哈。', 'PERSON', (8, 12), ], ], ner[1], ])  # past the end of the line
+    with pytest.raises(IndexError):
+        CkipCorefChunker.transform_ws(text=text_obj, ws=ws_obj, ner=ner_obj)
+    with pytest.raises(KeyError):
+        CkipCorefChunker.transform_pos(ws=ws_obj, pos=SegParagraph.from_list(pos), ner=ner_obj)
+
+def test_coref_state():
+    obj = CkipCorefChunker()
+    conparse_obj = ParseParagraph.from_list(conparse)
+    state = CorefState()
+    coref_list = [state.update(sent).to_list() for sent in conparse_obj]
+    assert coref_list == obj(conparse=conparse_obj).to_list()
+    assert state.num_sents == len(conparse)
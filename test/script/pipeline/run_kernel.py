@@ -15,6 +15,72 @@ def test_sentence_segmenter():
     obj.get_text(doc)
     assert doc.text.to_list() == text
 
+def test_sentence_segmenter_spaces():
+    obj = CkipSentenceSegmenter()
+    assert obj(raw=' 中文字耶，\t啊哈哈哈。\n\n\u3000「完蛋了！」 畢卡索\t他想 ').to_list() == text
+
+def test_sentence_segmenter_stream():
+    obj = CkipPipeline(sentence_segmenter='default')
+    chunks = [raw[idx:idx+3] for idx in range(0, len(raw), 3)]
+    docs = list(obj.iter_docs(chunks, batch_size=1))
+    assert [doc.text.to_list() for doc in docs] == [[sent] for sent in text]
+
+def test_sentence_segmenter_offsets():
+    obj = CkipSentenceSegmenter(with_offsets=True)
+    text_out, offsets = obj(raw=raw.replace('耶', ' 耶 '))
+    assert text_out.to_list() == text
+    assert offsets.spans.tolist() == [[0, 12], [13, 24]]
+    assert offsets.idxmaps[1] is None
+    assert offsets.to_raw(0, 3) == 4
+    assert offsets.span_to_raw(0, 3, 5) == (4, 7)
+
+def test_sentence_segmenter_offsets_pipeline():
+    obj = CkipPipeline(opts={'sentence_segmenter': {'with_offsets': True}})
+    doc = CkipDocument(raw=raw.replace('耶', ' 耶 '))
+    obj.get_ws(doc)
+    assert doc.text.to_list() == text
+    assert doc.ws.to_list() == ws
+    assert doc.text_offsets.spans.tolist() == [[0, 12], [13, 24]]
+
+def test_sentence_segmenter_parallel():
+    long_raw = raw.replace('耶', ' 耶 ') * 5
+    obj = CkipSentenceSegmenter(with_offsets=True)
+    obj_parallel = CkipSentenceSegmenter(with_offsets=True, workers=2, chunk_size=10)
+    text_out, offsets = obj(raw=long_raw)
+    text_parallel, offsets_parallel = obj_parallel(raw=long_raw)
+    assert text_parallel == text_out
+    assert offsets_parallel.spans.tolist() == offsets.spans.tolist()
+
+def test_sentence_segmenter_max_length():
+    obj = CkipPipeline(sentence_segmenter='default', opts={'sentence_segmenter': {'max_length': 6}})
+    doc = CkipDocument(raw=raw)
+    obj.get_text(doc)
+    assert doc.text.to_list() == [ '中文字耶，', '啊哈哈哈。', '「完蛋了！」', '畢卡索他想', ]
+
+    doc.ws = SegParagraph.from_list([ ws[0][:3], ws[0][3:], ws[1][:5], ws[1][5:], ])
+    doc.pos = SegParagraph.from_list([ pos[0][:3], pos[0][3:], pos[1][:5], pos[1][5:], ])
+    doc.ner = NerParagraph.from_list([ ner[0], [], [], [ [ '畢卡索', 'PERSON', (0, 3), ], ], ])
+    doc.conparse = ParseParagraph.from_list([ conparse[0][:1], conparse[0][1:], conparse[1][:2], conparse[1][2:], ])
+    obj.stitch(doc)
+    assert doc.text.to_list() == text
+    assert doc.ws.to_list() == ws
+    assert doc.pos.to_list() == pos
+    assert doc.ner.to_list() == ner
+    assert doc.conparse.to_list() == conparse
+
+def test_sentence_segmenter_max_length_offsets():
+    obj = CkipPipeline(opts={'sentence_segmenter': {'max_length': 6, 'with_offsets': True}})
+    doc = CkipDocument(raw=raw)
+    obj.get_text(doc)
+    assert doc.text.to_list() == [ '中文字耶，', '啊哈哈哈。', '「完蛋了！」', '畢卡索他想', ]
+    assert doc.text_offsets.spans.tolist() == [[0, 5], [5, 10], [11, 17], [17, 22]]
+
+    doc.ner = NerParagraph.from_list([ ner[0], [], [], [ [ '畢卡索', 'PERSON', (0, 3), ], ], ])
+    obj.stitch(doc)
+    assert doc.text.to_list() == text
+    assert doc.text_offsets.spans.tolist() == [[0, 10], [11, 22]]
+    assert doc.ner.to_list() == ner
+
 ################################################################################################################################
 
 def test_classic_con_parser_client():
@@ -23,6 +89,16 @@ def test_classic_con_parser_client():
     obj.get_conparse(doc)
     assert doc.conparse.to_list() == conparse
 
+def test_classic_con_parser_client_cache():
+    cache = ClauseCache()
+    obj = CkipPipeline(con_parser='classic-client', opts={'con_parser': {'cache': cache}})
+    for _ in range(2):
+        doc = CkipDocument(ws=SegParagraph.from_list(ws), pos=SegParagraph.from_list(pos))
+        obj.get_conparse(doc)
+        assert doc.conparse.to_list() == conparse
+    assert len(cache) == 4
+    assert cache.hits == 4
+
 ################################################################################################################################
 
 def test_tagger_word_segmenter():